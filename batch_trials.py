@@ -0,0 +1,263 @@
+
+from sequential_multipath import RESULT_COLUMNS
+from results_writer import ResultsWriter
+from disjoint_paths import disjoint_paths
+from graph import Graph
+import numpy as np
+import argparse
+import math
+
+def random_adjacency(trials, num_nodes, rng, min_links=-1):
+    """
+    Draws a (trials, num_nodes, num_nodes) stack of random adjacency matrices
+    the same way as Network.build_network.
+    """
+
+    if min_links == -1:
+        min_links = math.ceil(0.75 * num_nodes)
+
+    # Randomly assign links between nodes in the upper triangle and mirror them.
+    adjacency = np.triu(rng.random((trials, num_nodes, num_nodes)) < 0.5, k=1)
+    adjacency |= adjacency.transpose(0, 2, 1)
+
+    # Number of links each node is missing to reach the minimum degree.
+    min_degree = min(num_nodes - min_links + 1, num_nodes - 1)
+    deficit = min_degree - adjacency.sum(axis=2)
+
+    if (deficit > 0).any():
+
+        # Rank the unlinked nodes of every node in random order.
+        keys = rng.random((trials, num_nodes, num_nodes))
+        keys[adjacency] = np.inf
+        keys[:, np.arange(num_nodes), np.arange(num_nodes)] = np.inf
+
+        ranks = np.argsort(keys, axis=2)
+
+        # Link each deficient node to its first `deficit` unlinked nodes.
+        chosen = np.zeros_like(adjacency)
+        np.put_along_axis(chosen, ranks, np.arange(num_nodes) < deficit[:, :, None], axis=2)
+
+        adjacency |= chosen | chosen.transpose(0, 2, 1)
+
+    return adjacency
+
+def entangle(adjacency, num_qubits):
+    """
+    Returns the (trials, num_nodes, num_nodes) number of entangled pairs per
+    link, with the same allocation as Network.entangle_qubits_in_network.
+    """
+
+    num_nodes = adjacency.shape[1]
+
+    degree = adjacency.sum(axis=2)
+
+    # Number of qubits each node offers to each of its neighbors.
+    share = np.where(degree > 0, num_qubits // np.maximum(degree, 1), num_qubits)
+
+    share_u = share[:, :, None]
+    share_v = share[:, None, :]
+
+    upper = np.triu(adjacency, k=1)
+
+    # Requested pairs on the links to the higher indexed neighbors.
+    requested = np.where(share_u > 0, np.minimum(share_u, share_v), np.where(num_qubits[:, :, None] > 0, share_v, 0))
+    requested = np.where(upper, requested, 0)
+
+    # Only nodes with fewer qubits than neighbors run out, in ascending neighbor order.
+    before = np.cumsum(requested, axis=2) - requested
+    pairs = np.where(share_u == 0, np.clip(num_qubits[:, :, None] - before, 0, requested), requested)
+
+    return pairs + pairs.transpose(0, 2, 1)
+
+def random_sd_pairs(trials, num_nodes, rng):
+    """
+    Draws one SD pair per trial whose indices differ by more than one, like
+    Network.get_random_sd_pair.
+    """
+
+    source = rng.integers(0, num_nodes, trials)
+    dest = rng.integers(0, num_nodes, trials)
+
+    invalid = np.abs(source - dest) <= 1
+
+    # Redraw the invalid pairs until every pair is valid.
+    while invalid.any():
+
+        source[invalid] = rng.integers(0, num_nodes, invalid.sum())
+        dest[invalid] = rng.integers(0, num_nodes, invalid.sum())
+
+        invalid = np.abs(source - dest) <= 1
+
+    return source, dest
+
+def schedule(capacity, source, dest):
+    """
+    Runs the sequential multipath scheduling of one SD pair per trial on all
+    the trials at once and returns the k of every trial.
+
+    The entangled pairs are consumed from capacity in place. At each round
+    every trial still served takes its shortest path, with ties broken
+    towards the highest node index like Network.get_shortest_path.
+    """
+
+    trials, num_nodes, _ = capacity.shape
+
+    k = np.zeros(trials, dtype=np.int64)
+
+    # Trials whose SD pair is still connected.
+    alive = np.arange(trials)
+
+    while len(alive) > 0:
+
+        link = capacity[alive] > 0
+        s = source[alive]
+        d = dest[alive]
+
+        rows = np.arange(len(alive))
+
+        # Breadth-first search from the destinations until the sources are labeled.
+        dist = np.full((len(alive), num_nodes), -1)
+        dist[rows, d] = 0
+
+        frontier = np.zeros((len(alive), num_nodes), dtype=bool)
+        frontier[rows, d] = True
+
+        level = 0
+
+        while True:
+
+            searching = (dist[rows, s] == -1) & frontier.any(axis=1)
+
+            if not searching.any():
+                break
+
+            level += 1
+
+            frontier = (frontier[:, :, None] & link).any(axis=1) & (dist == -1) & searching[:, None]
+
+            dist[frontier] = level
+
+        found = dist[rows, s] != -1
+
+        alive, link, dist, s, d, rows = alive[found], link[found], dist[found], s[found], d[found], rows[:found.sum()]
+
+        k[alive] += 1
+
+        u = s.copy()
+
+        # Walk every path down the distance labels, consuming one pair per link.
+        while (u != d).any():
+
+            walking = u != d
+
+            candidates = link[rows, u] & (dist == (dist[rows, u] - 1)[:, None])
+
+            # Highest indexed neighbor one hop closer to the destination.
+            v = num_nodes - 1 - np.argmax(candidates[:, ::-1], axis=1)
+
+            t, a, b = alive[walking], u[walking], v[walking]
+
+            capacity[t, a, b] -= 1
+            capacity[t, b, a] -= 1
+
+            u = np.where(walking, v, u)
+
+    return k
+
+def run_batch(num_nodes, trials, rng, min_qubits=5, max_qubits=8, min_links=-1):
+    """
+    Generates and schedules a batch of random networks of the same size.
+
+    Returns:
+    --------
+    Dictionary mapping each of RESULT_COLUMNS to an array with one value per
+    trial.
+
+    """
+
+    adjacency = random_adjacency(trials, num_nodes, rng, min_links)
+
+    num_qubits = rng.integers(min_qubits, max_qubits, (trials, num_nodes), endpoint=True)
+
+    capacity = entangle(adjacency, num_qubits)
+
+    num_entangled_qubits = capacity.sum(axis=2)
+
+    source, dest = random_sd_pairs(trials, num_nodes, rng)
+
+    rows = np.arange(trials)
+
+    # Networks whose links hold one pair each get disjoint paths, like sequential_multipath_scheduling.
+    unit = (capacity <= 1).all(axis=(1, 2))
+    links = capacity > 0
+    bound = np.minimum(links[rows, source].sum(axis=1), links[rows, dest].sum(axis=1))
+
+    initial = capacity.copy()
+
+    k = schedule(capacity, source, dest)
+
+    # The greedy is already optimal when it uses every link of the source or the destination.
+    for t in np.flatnonzero(unit & (k < bound)):
+        k[t] = len(disjoint_paths(Graph.from_matrix(initial[t]), int(source[t]), int(dest[t])))
+
+    return {
+        "num_nodes": np.full(trials, num_nodes),
+        "num_sd_pairs": np.ones(trials, dtype=np.int64),
+        "min_num_qubits_assigned": num_qubits.min(axis=1),
+        "max_num_qubits_assigned": num_qubits.max(axis=1),
+        "min_num_entangled_qubits": num_entangled_qubits.min(axis=1),
+        "max_num_entangled_qubits": num_entangled_qubits.max(axis=1),
+        "k": k
+    }
+
+def run_monte_carlo(sizes = range(8, 33, 2), trials = 10000, seed = 0, batch_size = 1024, output = "results/sequential_multipath/monte_carlo.csv"):
+    """
+    Runs trials random networks per size in batches and writes one row per
+    trial to output, in the CSV schema of run_sequential_multipath.
+
+    Returns:
+    --------
+    Dictionary mapping each size to the array of k over its trials.
+
+    """
+
+    rng = np.random.default_rng(seed)
+
+    distributions = {}
+
+    with ResultsWriter(output, RESULT_COLUMNS, flush_every=batch_size) as writer:
+
+        for num_nodes in sizes:
+
+            ks = []
+
+            for start in range(0, trials, batch_size):
+
+                batch = run_batch(num_nodes, min(batch_size, trials - start), rng)
+
+                for i in range(len(batch["k"])):
+                    writer.write({column: int(batch[column][i]) for column in RESULT_COLUMNS})
+
+                ks.append(batch["k"])
+
+            distributions[num_nodes] = np.concatenate(ks)
+
+    return distributions
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Batched Monte Carlo trials of the sequential multipath scheduling.")
+    parser.add_argument("--min-nodes", type=int, default=8)
+    parser.add_argument("--max-nodes", type=int, default=32)
+    parser.add_argument("--step", type=int, default=2)
+    parser.add_argument("--trials", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--output", default="results/sequential_multipath/monte_carlo.csv")
+
+    args = parser.parse_args()
+
+    distributions = run_monte_carlo(range(args.min_nodes, args.max_nodes + 1, args.step), args.trials, args.seed, args.batch_size, args.output)
+
+    for num_nodes, k in distributions.items():
+        print('Num nodes: %d\tmean k: %.3f\tstd: %.3f\tk counts: %s' % (num_nodes, k.mean(), k.std(), np.bincount(k).tolist()))
@@ -0,0 +1,210 @@
+
+from network import Network
+from sequential_multipath import sequential_multipath_scheduling
+from utils import copy_graph
+import numpy as np
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+# Stages of the pipeline in execution order, with the unit of their throughput.
+STAGES = [
+    ("build_network", "nodes/s"),
+    ("assign_qubits", "nodes/s"),
+    ("entangle_qubits_in_network", "nodes/s"),
+    ("get_entangled_network", "nodes/s"),
+    ("get_paths", "paths/s"),
+    ("sequential_multipath_scheduling", "pairs/s")
+]
+
+def random_sd_pairs(num_nodes, num_pairs, rng):
+    """
+    Returns distinct random SD pairs with distinct end points.
+    """
+
+    pairs = []
+
+    while len(pairs) < num_pairs:
+
+        s, d = (int(x) for x in rng.choice(num_nodes, size=2, replace=False))
+
+        if (s, d) not in pairs and (d, s) not in pairs:
+            pairs.append((s, d))
+
+    return pairs
+
+def measure_time(fn):
+    """
+    Runs fn and returns its result and the wall-clock seconds it took.
+    """
+
+    start = time.perf_counter()
+
+    result = fn()
+
+    return result, time.perf_counter() - start
+
+def measure_peak_memory(fn):
+    """
+    Runs fn and returns its result and the peak memory it allocated on top of
+    what was already allocated. Requires tracemalloc to be tracing.
+    """
+
+    tracemalloc.reset_peak()
+
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    result = fn()
+
+    return result, tracemalloc.get_traced_memory()[1] - baseline
+
+def run_pipeline(num_nodes, num_pairs, seed, max_enumeration_nodes, measure):
+    """
+    Runs every stage once through measure, one of measure_time or
+    measure_peak_memory, and returns the measurement of each stage and the
+    number of items each stage processed.
+    """
+
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+
+    network = Network()
+    measurements = {}
+    counts = {}
+
+    _, measurements["build_network"] = measure(lambda: network.build_network(num_nodes, num_nodes, rng=rng))
+    _, measurements["assign_qubits"] = measure(network.assign_qubits)
+    _, measurements["entangle_qubits_in_network"] = measure(network.entangle_qubits_in_network)
+    graph, measurements["get_entangled_network"] = measure(network.get_entangled_network)
+
+    D = random_sd_pairs(num_nodes, num_pairs, rng)
+
+    # Enumerating every simple path is exponential, so it is skipped on large networks.
+    if num_nodes <= max_enumeration_nodes:
+
+        paths, measurements["get_paths"] = measure(lambda: network.get_paths(D[0][0], D[0][1], graph))
+
+        counts["get_paths"] = len(paths)
+
+    graph_copy = copy_graph(graph)
+
+    _, measurements["sequential_multipath_scheduling"] = measure(lambda: sequential_multipath_scheduling(D, network, graph_copy))
+
+    counts["sequential_multipath_scheduling"] = num_pairs
+
+    return measurements, counts
+
+def benchmark_case(num_nodes, num_pairs, seed, repeats, max_enumeration_nodes):
+    """
+    Returns one record per stage with the best wall-clock time over the
+    repeats, the throughput and the peak memory allocated by the stage.
+    """
+
+    times = {}
+
+    # Every repeat runs on the same inputs.
+    for _ in range(repeats):
+
+        measurements, counts = run_pipeline(num_nodes, num_pairs, seed, max_enumeration_nodes, measure_time)
+
+        for stage, seconds in measurements.items():
+            times[stage] = min(times.get(stage, seconds), seconds)
+
+    # Measure the memory in a separate run, tracing slows the stages down.
+    tracemalloc.start()
+
+    try:
+        peaks, _ = run_pipeline(num_nodes, num_pairs, seed, max_enumeration_nodes, measure_peak_memory)
+
+    finally:
+        tracemalloc.stop()
+
+    records = []
+
+    for stage, unit in STAGES:
+
+        if stage not in times:
+            continue
+
+        items = counts.get(stage, num_nodes)
+        seconds = times[stage]
+
+        records.append({
+            "stage": stage,
+            "num_nodes": num_nodes,
+            "num_sd_pairs": num_pairs,
+            "seconds": seconds,
+            "throughput": items / seconds if seconds > 0 else None,
+            "throughput_unit": unit,
+            "peak_memory_bytes": peaks[stage]
+        })
+
+    return records
+
+def scaling_exponents(records):
+    """
+    Fits seconds ~ num_nodes ** exponent for every stage on a log-log scale.
+    """
+
+    exponents = {}
+
+    for stage, _ in STAGES:
+
+        points = [(r["num_nodes"], r["seconds"]) for r in records if r["stage"] == stage and r["seconds"] > 0]
+
+        if len(set(n for n, _ in points)) < 2:
+            continue
+
+        x = np.log([n for n, _ in points])
+        y = np.log([t for _, t in points])
+
+        exponents[stage] = float(np.polyfit(x, y, 1)[0])
+
+    return exponents
+
+def run_benchmark(node_counts, pair_counts, seed = 0, repeats = 3, max_enumeration_nodes = 12):
+    """
+    Benchmarks every stage on the grid of node and SD-pair counts.
+    """
+
+    records = []
+
+    for num_nodes in node_counts:
+
+        for num_pairs in pair_counts:
+
+            # Every SD pair needs two distinct nodes.
+            if num_pairs > num_nodes * (num_nodes - 1) // 2:
+                continue
+
+            records.extend(benchmark_case(num_nodes, num_pairs, seed, repeats, max_enumeration_nodes))
+
+    return {
+        "records": records,
+        "scaling_exponents": scaling_exponents(records)
+    }
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark the stages of the sequential multipath scheduling.")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[8, 16, 32, 64, 128, 256])
+    parser.add_argument("--pairs", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-enumeration-nodes", type=int, default=12)
+    parser.add_argument("--output", default=None, help="JSON file to write, standard output when omitted.")
+
+    args = parser.parse_args()
+
+    report = run_benchmark(args.nodes, args.pairs, args.seed, args.repeats, args.max_enumeration_nodes)
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=4)
+        print('')
+
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
@@ -0,0 +1,159 @@
+
+import heapq
+
+def is_unit_capacity(graph):
+    """
+    Returns whether every link of the graph holds exactly one entangled pair.
+    """
+
+    return all(weight == 1 for _, _, weight in graph.edges())
+
+def disjoint_paths(graph, s, d, k=None, stats=None):
+    """
+    Returns up to k paths from s to d, no link being used by more paths than
+    its weight, with the smallest total number of hops.
+
+    Uses Bhandari's algorithm: every round finds the shortest path in the
+    residual network, where a link can be traversed against a previous
+    path at cost -1 to reroute that path, and the links carrying flow are
+    decomposed into paths at the end. Dijkstra's algorithm runs on costs
+    made non-negative by node potentials, so the paths take
+    O(k * E * log(V)) time.
+
+    With unit weights the paths are edge-disjoint, and without k the number
+    of paths is the largest reachable, like max_flow_paths.
+
+    Parameters:
+    -----------
+    graph : Graph
+        Number of entangled pairs of every link. Left unchanged.
+
+    s, d : int
+        Source and destination.
+
+    k : int
+        Maximum number of paths. As many as possible when None.
+
+    stats : Instrumentation
+        Counts the nodes expanded by the searches when given.
+
+    Returns:
+    --------
+    The paths, shortest first.
+
+    """
+
+    num_nodes = len(graph)
+
+    # Net flow of each link in each direction, antisymmetric.
+    flow = [dict.fromkeys(graph.row(u), 0) for u in range(num_nodes)]
+
+    # Hop distances from s, which make the reduced costs non-negative.
+    potential = [None] * num_nodes
+    potential[s] = 0
+
+    frontier = [s]
+
+    while len(frontier) > 0:
+
+        next_frontier = []
+
+        for u in frontier:
+
+            for v in graph.row(u):
+
+                if potential[v] is None:
+                    potential[v] = potential[u] + 1
+                    next_frontier.append(v)
+
+        frontier = next_frontier
+
+    if potential[d] is None:
+        return []
+
+    value = 0
+
+    while k is None or value < k:
+
+        # Dijkstra on the reduced costs of the residual links.
+        dist = [None] * num_nodes
+        parent = [None] * num_nodes
+        dist[s] = 0
+
+        heap = [(0, s)]
+        expanded = 0
+
+        while len(heap) > 0:
+
+            du, u = heapq.heappop(heap)
+
+            if du > dist[u]:
+                continue
+
+            expanded += 1
+
+            if u == d:
+                break
+
+            for v, weight in graph.row(u).items():
+
+                if flow[u][v] >= weight:
+                    continue
+
+                # Traversing against a path cancels it, otherwise the link costs one hop.
+                cost = -1 if flow[u][v] < 0 else 1
+
+                dv = du + cost + potential[u] - potential[v]
+
+                if dist[v] is None or dv < dist[v]:
+                    dist[v] = dv
+                    parent[v] = u
+                    heapq.heappush(heap, (dv, v))
+
+        if stats is not None:
+            stats.count("nodes_expanded", expanded)
+
+        if dist[d] is None:
+            break
+
+        # Nodes left unsettled keep a valid potential when raised by dist[d].
+        for u in range(num_nodes):
+
+            if potential[u] is not None:
+                potential[u] += min(dist[u], dist[d]) if dist[u] is not None else dist[d]
+
+        v = d
+
+        while v != s:
+
+            u = parent[v]
+
+            flow[u][v] += 1
+            flow[v][u] -= 1
+
+            v = u
+
+        value += 1
+
+    paths = []
+
+    # The flow has no cycles, so following it from s gives simple paths.
+    for _ in range(value):
+
+        path = [s]
+
+        while path[-1] != d:
+
+            u = path[-1]
+            v = next(v for v, f in flow[u].items() if f > 0)
+
+            flow[u][v] -= 1
+            flow[v][u] += 1
+
+            path.append(v)
+
+        paths.append(path)
+
+    paths.sort(key=len)
+
+    return paths
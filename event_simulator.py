@@ -0,0 +1,349 @@
+
+from network import Network
+from graph import Graph
+from topologies import TOPOLOGIES
+from collections import deque
+import numpy as np
+import argparse
+import heapq
+import random
+import time
+import json
+
+# Event kinds, ordered so that simultaneous pairs expire before they are consumed.
+EXPIRE = 0
+GENERATE = 1
+REQUEST = 2
+SERVE = 3
+
+class _Draws:
+
+    def __init__(self, draw, batch_size=65536):
+        """
+        Hands out random variates one at a time from batches drawn with
+        draw(batch_size), avoiding a NumPy call per event.
+        """
+
+        self.draw = draw
+        self.batch_size = batch_size
+        self.values = []
+        self.next = 0
+
+    def __call__(self):
+
+        if self.next == len(self.values):
+            self.values = self.draw(self.batch_size).tolist()
+            self.next = 0
+
+        self.next += 1
+
+        return self.values[self.next - 1]
+
+class EntanglementSimulator:
+
+    def __init__(self, slots, attempt_interval=1e-3, success_probability=0.1, coherence_time=0.1, request_rate=10.0, serve_interval=1e-2, max_wait=1.0, demands=None, rng=None):
+        """
+        Discrete-event simulation of entanglement generation, decoherence and
+        consumption on the links of a network.
+
+        Every link attempts to generate an entangled pair every
+        attempt_interval and succeeds with success_probability while it has a
+        free memory slot. A pair expires coherence_time after it is
+        generated. SD requests arrive as a Poisson process and are served by
+        consuming the oldest pair of every link on the shortest path of
+        links holding pairs, as in the sequential multipath scheduling.
+        Requests that cannot be served on arrival wait and are retried every
+        serve_interval, until they are dropped after max_wait.
+
+        Parameters:
+        -----------
+        slots : Graph
+            Number of memory slots of every link, e.g. the entangled links
+            from Network.get_entangled_network.
+
+        attempt_interval : float
+            Seconds between two generation attempts on a link.
+
+        success_probability : float
+            Probability that a generation attempt succeeds.
+
+        coherence_time : float
+            Seconds an entangled pair lives before it decoheres.
+
+        request_rate : float
+            Mean number of SD requests per second.
+
+        serve_interval : float
+            Seconds between two retries of the waiting requests.
+
+        max_wait : float
+            Seconds a request waits before it is dropped.
+
+        demands : list
+            SD pairs the requests are drawn from uniformly. Any two distinct
+            nodes when None.
+
+        rng : numpy.random.Generator
+            Source of randomness. A fresh unseeded generator when None.
+
+        Description:
+        --------------
+        available : Graph
+            Number of live entangled pairs of every link.
+
+        pairs : dict
+            Link (u, v) with u < v mapped to the generation times of its live
+            pairs, oldest first.
+
+        now : float
+            Current simulated time.
+
+        """
+
+        if rng is None:
+            rng = np.random.default_rng()
+
+        self.slots = slots
+        self.attempt_interval = attempt_interval
+        self.coherence_time = coherence_time
+        self.serve_interval = serve_interval
+        self.max_wait = max_wait
+        self.demands = demands
+
+        self.available = Graph(len(slots))
+        self.pairs = {(u, v): deque() for u, v, _ in slots.edges()}
+
+        self.now = 0.0
+        self.events = []
+        self.sequence = 0
+        self.waiting = deque()
+
+        # Only the successful attempts are simulated, so a link waits a geometric number of attempts.
+        self.attempts = _Draws(lambda n: rng.geometric(success_probability, n))
+        self.interarrival = _Draws(lambda n: rng.exponential(1 / request_rate, n))
+        self.uniform = _Draws(lambda n: rng.random(n))
+
+        # Routing reuses the shortest path search of the scheduler.
+        self.router = Network()
+
+        self.counters = {
+            "events": 0,
+            "pairs_generated": 0,
+            "pairs_expired": 0,
+            "pairs_consumed": 0,
+            "requests": 0,
+            "requests_served": 0,
+            "requests_dropped": 0
+        }
+
+        self.latencies = []
+
+    def schedule(self, at, kind, u, v):
+        """
+        Adds an event at the simulated time.
+        """
+
+        heapq.heappush(self.events, (at, kind, self.sequence, u, v))
+
+        self.sequence += 1
+
+    def random_sd_pair(self):
+        """
+        Returns the SD pair of a new request.
+        """
+
+        if self.demands is not None:
+            return self.demands[int(self.uniform() * len(self.demands))]
+
+        num_nodes = len(self.slots)
+
+        s = int(self.uniform() * num_nodes)
+        d = int(self.uniform() * (num_nodes - 1))
+
+        return s, d + 1 if d >= s else d
+
+    def generate(self, u, v):
+        """
+        Stores a new entangled pair on the link.
+
+        A link stops attempting while all its slots hold pairs, and resumes
+        from release once one of them is expired or consumed. Attempts are
+        memoryless, so this gives the same pairs as attempting all along
+        without simulating the attempts that would be discarded.
+        """
+
+        pairs = self.pairs[(u, v)]
+
+        pairs.append(self.now)
+
+        self.available.set_weight(u, v, len(pairs))
+        self.schedule(self.now + self.coherence_time, EXPIRE, u, v)
+
+        self.counters["pairs_generated"] += 1
+
+        if len(pairs) < self.slots.get_weight(u, v):
+            self.schedule(self.now + self.attempt_interval * self.attempts(), GENERATE, u, v)
+
+    def release(self, u, v):
+        """
+        Removes the oldest pair of the link, resuming the generation
+        attempts if all its slots were full.
+        """
+
+        pairs = self.pairs[(u, v)]
+
+        if len(pairs) == self.slots.get_weight(u, v):
+            self.schedule(self.now + self.attempt_interval * self.attempts(), GENERATE, u, v)
+
+        pairs.popleft()
+
+    def expire(self, u, v):
+        """
+        Drops the decohered pairs of the link.
+
+        Pairs are consumed oldest first and all live for coherence_time, so
+        the expired pairs are at the front. Pairs that were consumed before
+        their expiry leave nothing to drop.
+        """
+
+        pairs = self.pairs[(u, v)]
+
+        while len(pairs) > 0 and pairs[0] + self.coherence_time <= self.now:
+
+            self.release(u, v)
+
+            self.available.decrement(u, v)
+
+            self.counters["pairs_expired"] += 1
+
+    def serve(self, arrival, s, d):
+        """
+        Consumes a path from s to d. Returns False when there is none.
+        """
+
+        path = self.router.get_shortest_path(s, d, self.available)
+
+        if len(path) == 0:
+            return False
+
+        for u, v in zip(path, path[1:]):
+
+            self.release(min(u, v), max(u, v))
+
+        self.router.update_network(path, self.available)
+
+        self.counters["pairs_consumed"] += len(path) - 1
+        self.counters["requests_served"] += 1
+
+        self.latencies.append(self.now - arrival)
+
+        return True
+
+    def run(self, duration):
+        """
+        Simulates duration seconds and returns the statistics of the run.
+
+        Returns:
+        --------
+        Dictionary with the event counters, the throughput in served
+        requests per simulated second, the latency statistics of the served
+        requests, the number of requests still waiting and the number of
+        events processed per wall-clock second.
+
+        """
+
+        start = time.perf_counter()
+
+        for u, v, _ in self.slots.edges():
+            self.schedule(self.attempt_interval * self.attempts(), GENERATE, u, v)
+
+        self.schedule(self.interarrival(), REQUEST, -1, -1)
+        self.schedule(self.serve_interval, SERVE, -1, -1)
+
+        while len(self.events) > 0 and self.events[0][0] <= duration:
+
+            self.now, kind, _, u, v = heapq.heappop(self.events)
+
+            self.counters["events"] += 1
+
+            if kind == GENERATE:
+                self.generate(u, v)
+
+            elif kind == EXPIRE:
+                self.expire(u, v)
+
+            elif kind == REQUEST:
+                self.counters["requests"] += 1
+
+                s, d = self.random_sd_pair()
+
+                if not self.serve(self.now, s, d):
+                    self.waiting.append((self.now, s, d))
+
+                self.schedule(self.now + self.interarrival(), REQUEST, -1, -1)
+
+            else:
+                # Retry the waiting requests in arrival order.
+                for _ in range(len(self.waiting)):
+
+                    request = self.waiting.popleft()
+
+                    if self.serve(*request):
+                        continue
+
+                    if self.now - request[0] >= self.max_wait:
+                        self.counters["requests_dropped"] += 1
+                    else:
+                        self.waiting.append(request)
+
+                self.schedule(self.now + self.serve_interval, SERVE, -1, -1)
+
+        self.now = duration
+
+        elapsed = time.perf_counter() - start
+
+        latencies = np.array(self.latencies)
+
+        results = dict(self.counters)
+
+        results["requests_waiting"] = len(self.waiting)
+        results["throughput"] = self.counters["requests_served"] / duration if duration > 0 else 0
+        results["mean_latency"] = float(latencies.mean()) if len(latencies) > 0 else None
+        results["p50_latency"] = float(np.percentile(latencies, 50)) if len(latencies) > 0 else None
+        results["p99_latency"] = float(np.percentile(latencies, 99)) if len(latencies) > 0 else None
+        results["events_per_second"] = self.counters["events"] / elapsed if elapsed > 0 else 0
+
+        return results
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Event-driven simulation of entanglement generation and consumption.")
+    parser.add_argument("--nodes", type=int, default=10)
+    parser.add_argument("--topology", choices=list(TOPOLOGIES), default=None, help="Sparse topology generator, the dense random network when omitted.")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--attempt-interval", type=float, default=1e-3)
+    parser.add_argument("--success-probability", type=float, default=0.1)
+    parser.add_argument("--coherence-time", type=float, default=0.1)
+    parser.add_argument("--request-rate", type=float, default=10.0)
+    parser.add_argument("--serve-interval", type=float, default=1e-2)
+    parser.add_argument("--max-wait", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    random.seed(args.seed)
+
+    network = Network()
+
+    if args.topology is None:
+        network.build_network(args.nodes, args.nodes, rng=rng)
+    else:
+        network.build_topology(args.topology, args.nodes, rng)
+
+    network.assign_qubits()
+    network.entangle_qubits_in_network()
+
+    simulator = EntanglementSimulator(network.get_entangled_network(), args.attempt_interval, args.success_probability, args.coherence_time, args.request_rate, args.serve_interval, args.max_wait, rng=rng)
+
+    print(json.dumps(simulator.run(args.duration), indent=2))
@@ -0,0 +1,157 @@
+
+import heapq
+
+def werner_parameter(fidelity):
+    """
+    Returns the Werner parameter of an entangled pair of the fidelity.
+
+    Entanglement swapping multiplies the Werner parameters of the pairs, so
+    the fidelity of a path only decreases with every hop.
+    """
+
+    return max(0.0, (4 * fidelity - 1) / 3)
+
+def werner_fidelity(werner):
+    """
+    Returns the fidelity of an entangled pair of the Werner parameter.
+    """
+
+    return 0.25 + 0.75 * werner
+
+def path_fidelity(path, fidelities):
+    """
+    Returns the end-to-end fidelity of the path after swapping the
+    entangled pairs of its links, given the fidelity of every link.
+    """
+
+    werner = 1.0
+
+    for u, v in zip(path, path[1:]):
+        werner *= werner_parameter(fidelities.get_weight(u, v))
+
+    return werner_fidelity(werner)
+
+class PathBounds:
+
+    def __init__(self, graph, dest, max_hops=None, fidelities=None, min_fidelity=None):
+        """
+        Hop and fidelity bounds of the paths to a destination, with the
+        lookahead to prune partial paths that can no longer meet them.
+
+        Parameters:
+        -----------
+        graph : Graph
+            Links usable by the paths.
+
+        dest : int
+            Destination of the paths.
+
+        max_hops : int
+            Maximum number of links of a path. Unbounded when None.
+
+        fidelities : Graph
+            Fidelity of every link, e.g. from Network.get_link_fidelities.
+            Required with min_fidelity.
+
+        min_fidelity : float
+            Minimum end-to-end fidelity of a path. Unbounded when None.
+
+        Description:
+        --------------
+        dist : list
+            Fewest hops from every node to dest, len(graph) when
+            unreachable.
+
+        best : list
+            Largest Werner parameter of a path from every node to dest, 0
+            when unreachable.
+
+        min_werner : float
+            Werner parameter of min_fidelity.
+
+        """
+
+        if min_fidelity is not None and fidelities is None:
+            raise ValueError("A minimum fidelity needs the fidelities of the links")
+
+        self.graph = graph
+        self.dest = dest
+        self.max_hops = max_hops
+        self.fidelities = fidelities
+        self.min_werner = (4 * min_fidelity - 1) / 3 if min_fidelity is not None else None
+
+        unreachable = len(graph)
+
+        self.dist = [unreachable] * len(graph)
+        self.dist[dest] = 0
+
+        frontier = [dest]
+
+        # Breadth-first search of the hop distances to the destination.
+        while len(frontier) > 0:
+
+            next_frontier = []
+
+            for u in frontier:
+
+                for v in graph.neighbors(u):
+
+                    if self.dist[v] == unreachable:
+                        self.dist[v] = self.dist[u] + 1
+                        next_frontier.append(v)
+
+            frontier = next_frontier
+
+        self.best = [0.0] * len(graph)
+
+        if self.min_werner is not None:
+
+            self.best[dest] = 1.0
+
+            heap = [(-1.0, dest)]
+
+            # Dijkstra on the products of the Werner parameters, which only shrink along a path.
+            while len(heap) > 0:
+
+                werner, u = heapq.heappop(heap)
+                werner = -werner
+
+                if werner < self.best[u]:
+                    continue
+
+                for v in graph.neighbors(u):
+
+                    candidate = werner * self.link_werner(u, v)
+
+                    if candidate > self.best[v]:
+                        self.best[v] = candidate
+                        heapq.heappush(heap, (-candidate, v))
+
+    def link_werner(self, u, v):
+        """
+        Returns the Werner parameter of the link, 1 without fidelities.
+        """
+
+        if self.fidelities is None:
+            return 1.0
+
+        return werner_parameter(self.fidelities.get_weight(u, v))
+
+    def admits(self, node, hops, werner):
+        """
+        Returns whether a partial path reaching node after hops links, with
+        the Werner parameter werner so far, can still be completed within
+        the bounds.
+        """
+
+        if self.dist[node] == len(self.graph):
+            return False
+
+        if self.max_hops is not None and hops + self.dist[node] > self.max_hops:
+            return False
+
+        # The tolerance keeps paths exactly at the bound despite rounding.
+        if self.min_werner is not None and werner * self.best[node] < self.min_werner - 1e-12:
+            return False
+
+        return True
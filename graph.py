@@ -0,0 +1,302 @@
+
+import numpy as np
+
+class Graph:
+
+    def __init__(self, num_nodes=0):
+        """
+        Sparse undirected graph stored as adjacency lists.
+
+        Parameters:
+        -----------
+        num_nodes : int
+            Number of nodes in the graph.
+
+        Description:
+        --------------
+        adj : list
+            One dictionary per node mapping the neighbor node to the link
+            weight. The weight is 1 for the physical links of the network and
+            the number of entangled qubit pairs for the entangled network.
+
+            Links with weight 0 are not stored, so the memory grows with the
+            number of links and the neighbors of a node are found in time
+            proportional to its degree.
+
+            For Example:
+                A path 0 - 1 - 2 where 0 and 1 share 2 entangled pairs and 1
+                and 2 share 1 entangled pair is represented as follows:
+
+                [
+                    {1: 2},
+                    {0: 2, 2: 1},
+                    {1: 1}
+                ]
+
+        """
+
+        self.adj = [{} for _ in range(num_nodes)]
+
+    def __len__(self):
+        """
+        Returns the number of nodes in the graph.
+        """
+
+        return len(self.adj)
+
+    def add_node(self):
+        """
+        Adds a node without links and returns its index.
+        """
+
+        self.adj.append({})
+
+        return len(self.adj) - 1
+
+    def get_weight(self, u, v):
+        """
+        Returns the weight of the link between u and v.
+        """
+
+        return self.adj[u].get(v, 0)
+
+    def has_edge(self, u, v):
+        """
+        Checks if there is a link between u and v.
+        """
+
+        return v in self.adj[u]
+
+    def set_weight(self, u, v, weight):
+        """
+        Sets the weight of the link between u and v. A weight of 0 or less
+        removes the link.
+        """
+
+        if weight > 0:
+            self.adj[u][v] = weight
+            self.adj[v][u] = weight
+
+        else:
+            self.adj[u].pop(v, None)
+            self.adj[v].pop(u, None)
+
+    def add_edge(self, u, v, weight=1):
+        """
+        Adds the weight to the link between u and v.
+        """
+
+        self.set_weight(u, v, self.get_weight(u, v) + weight)
+
+    def decrement(self, u, v, amount=1):
+        """
+        Decrements the weight of the link between u and v and returns the new
+        weight.
+        """
+
+        weight = self.get_weight(u, v) - amount
+
+        self.set_weight(u, v, weight)
+
+        return max(weight, 0)
+
+    def row(self, u):
+        """
+        Returns the dictionary mapping the neighbors of the node to the link
+        weights. It must not be modified.
+        """
+
+        return self.adj[u]
+
+    def neighbors(self, u):
+        """
+        Returns the neighbors of the node in no particular order.
+        """
+
+        return self.adj[u].keys()
+
+    def degree(self, u):
+        """
+        Returns the number of neighbors of the node.
+        """
+
+        return len(self.adj[u])
+
+    def edges(self):
+        """
+        Yields each link once as a (u, v, weight) tuple with u <= v.
+        """
+
+        for u, row in enumerate(self.adj):
+
+            for v, weight in row.items():
+
+                if u <= v:
+                    yield (u, v, weight)
+
+    def edge_arrays(self):
+        """
+        Returns the links as arrays (us, vs, weights) with u < v, sorted by u
+        and then by v.
+        """
+
+        counts = [len(row) for row in self.adj]
+
+        us = np.repeat(np.arange(len(self.adj), dtype=np.int64), counts)
+        vs = np.fromiter((v for row in self.adj for v in row), dtype=np.int64, count=len(us))
+        weights = np.fromiter((w for row in self.adj for w in row.values()), dtype=np.int64, count=len(us))
+
+        keep = us < vs
+        us, vs, weights = us[keep], vs[keep], weights[keep]
+
+        order = np.lexsort((vs, us))
+
+        return us[order], vs[order], weights[order]
+
+    def to_csr(self):
+        """
+        Returns the graph in compressed sparse row form as arrays (indptr,
+        indices, weights): the neighbors of node u are
+        indices[indptr[u]:indptr[u + 1]], in ascending order.
+        """
+
+        counts = [len(row) for row in self.adj]
+
+        indptr = np.zeros(len(self.adj) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(counts)
+
+        rows = np.repeat(np.arange(len(self.adj), dtype=np.int64), counts)
+        indices = np.fromiter((v for row in self.adj for v in row), dtype=np.int64, count=len(rows))
+        weights = np.fromiter((w for row in self.adj for w in row.values()), dtype=np.int64, count=len(rows))
+
+        order = np.lexsort((indices, rows))
+
+        return indptr, indices[order], weights[order]
+
+    def num_edges(self):
+        """
+        Returns the number of links in the graph.
+        """
+
+        return sum(1 for _ in self.edges())
+
+    def copy(self):
+        """
+        Returns a copy of the graph.
+        """
+
+        graph = Graph()
+        graph.adj = [dict(row) for row in self.adj]
+
+        return graph
+
+    def to_matrix(self):
+        """
+        Returns the dense adjacency matrix as a list of lists.
+        """
+
+        num_nodes = len(self.adj)
+
+        matrix = [[0] * num_nodes for _ in range(num_nodes)]
+
+        for u, row in enumerate(self.adj):
+
+            for v, weight in row.items():
+                matrix[u][v] = weight
+
+        return matrix
+
+    @classmethod
+    def from_edges(cls, num_nodes, us, vs, weights=None):
+        """
+        Builds the graph from arrays of link end points.
+
+        Parameters:
+        -----------
+        num_nodes : int
+            Number of nodes in the graph.
+
+        us, vs : array_like
+            End points of the links. Each link must appear only once.
+
+        weights : array_like
+            Weights of the links. Every link has weight 1 when None.
+
+        """
+
+        graph = cls()
+        graph.set_edges(num_nodes, us, vs, weights)
+
+        return graph
+
+    def set_edges(self, num_nodes, us, vs, weights=None):
+        """
+        Replaces every link of the graph in place, with the same arguments
+        as from_edges.
+
+        The adjacency dictionaries of the existing nodes are cleared and
+        refilled instead of being allocated again, so a graph can be reused
+        across trials.
+        """
+
+        us = np.asarray(us, dtype=np.int64)
+        vs = np.asarray(vs, dtype=np.int64)
+
+        if weights is None:
+            weights = np.ones(len(us), dtype=np.int64)
+
+        # Store every link in both directions, grouped by node.
+        rows = np.concatenate([us, vs])
+        cols = np.concatenate([vs, us])
+        weights = np.concatenate([weights, weights])
+
+        order = np.argsort(rows, kind='stable')
+
+        bounds = np.searchsorted(rows[order], np.arange(num_nodes + 1)).tolist()
+        cols = cols[order].tolist()
+        weights = weights[order].tolist()
+
+        del self.adj[num_nodes:]
+
+        for i in range(num_nodes):
+
+            links = zip(cols[bounds[i]:bounds[i + 1]], weights[bounds[i]:bounds[i + 1]])
+
+            if i < len(self.adj):
+                self.adj[i].clear()
+                self.adj[i].update(links)
+
+            else:
+                self.adj.append(dict(links))
+
+    @classmethod
+    def from_csr(cls, indptr, indices, weights):
+        """
+        Builds the graph from the arrays returned by to_csr.
+        """
+
+        bounds = np.asarray(indptr).tolist()
+        indices = np.asarray(indices).tolist()
+        weights = np.asarray(weights).tolist()
+
+        graph = cls()
+        graph.adj = [dict(zip(indices[bounds[i]:bounds[i + 1]], weights[bounds[i]:bounds[i + 1]])) for i in range(len(bounds) - 1)]
+
+        return graph
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Builds the graph from a dense adjacency matrix.
+        """
+
+        graph = cls(len(matrix))
+
+        for u, row in enumerate(matrix):
+
+            for v, weight in enumerate(row):
+
+                if weight > 0:
+                    graph.adj[u][v] = weight
+
+        return graph
@@ -0,0 +1,95 @@
+
+from contextlib import contextmanager, nullcontext
+import time
+
+# Counters reported in the results rows.
+COUNTERS = [
+    "nodes_expanded",
+    "paths_enumerated",
+    "rounds",
+    "residual_updates",
+    "links_depleted",
+    "path_cache_hits",
+    "path_cache_misses"
+]
+
+# Stages timed in the results rows.
+TIMERS = [
+    "build_network",
+    "assign_qubits",
+    "entangle_qubits_in_network",
+    "get_entangled_network",
+    "scheduling"
+]
+
+# Columns added to the results rows when a run is instrumented.
+INSTRUMENTATION_COLUMNS = COUNTERS + ["rounds_per_sd_pair"] + ["time_" + name for name in TIMERS]
+
+class Instrumentation:
+
+    def __init__(self):
+        """
+        Counters and wall-clock timers of a single run.
+
+        Instrumentation is enabled by assigning an instance to
+        Network.stats, which the network methods and the schedulers update
+        when it is not None.
+
+        Description:
+        --------------
+        counters : dict
+            Counter name mapped to its value. See COUNTERS.
+
+        timers : dict
+            Stage name mapped to the seconds spent in it. See TIMERS.
+
+        """
+
+        self.counters = {name: 0 for name in COUNTERS}
+        self.timers = {name: 0.0 for name in TIMERS}
+
+    def count(self, name, amount=1):
+        """
+        Increments the counter.
+        """
+
+        self.counters[name] += amount
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Adds the wall-clock time spent in the with block to the stage.
+        """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.timers[name] += time.perf_counter() - start
+
+    def as_row(self, num_sd_pairs):
+        """
+        Returns the counters and timers keyed by INSTRUMENTATION_COLUMNS.
+        """
+
+        row = dict(self.counters)
+
+        row["rounds_per_sd_pair"] = self.counters["rounds"] / num_sd_pairs if num_sd_pairs > 0 else 0
+
+        for name, seconds in self.timers.items():
+            row["time_" + name] = seconds
+
+        return row
+
+def stage_timer(stats, name):
+    """
+    Returns stats.timer(name), or a context manager doing nothing when stats
+    is None.
+    """
+
+    if stats is None:
+        return nullcontext()
+
+    return stats.timer(name)
@@ -0,0 +1,130 @@
+
+import heapq
+
+def _shortest_path(graph, s, d, blocked_nodes, blocked_links, stats=None):
+    """
+    Returns the shortest path from s to d avoiding the blocked nodes and
+    links, or an empty list when there is none.
+
+    Ties are broken towards the neighbor with the highest index at each hop,
+    like Network.get_shortest_path.
+    """
+
+    # Hop distance of each node to the destination.
+    dist = {d: 0}
+
+    frontier = [d]
+
+    expanded = 0
+
+    # Breadth-first search from the destination until the source's layer is complete.
+    while len(frontier) > 0 and s not in dist:
+
+        expanded += len(frontier)
+
+        next_frontier = []
+
+        for u in frontier:
+
+            for v in graph.neighbors(u):
+
+                if v not in dist and v not in blocked_nodes and (min(u, v), max(u, v)) not in blocked_links:
+                    dist[v] = dist[u] + 1
+                    next_frontier.append(v)
+
+        frontier = next_frontier
+
+    if stats is not None:
+        stats.count("nodes_expanded", expanded)
+
+    if s not in dist:
+        return []
+
+    path = [s]
+    u = s
+
+    # Walk down the distance labels, preferring the highest node index.
+    while u != d:
+
+        u = max(v for v in graph.neighbors(u) if dist.get(v, -1) == dist[u] - 1 and (min(u, v), max(u, v)) not in blocked_links)
+
+        path.append(u)
+
+    return path
+
+def shortest_paths(graph, s, d, stats=None):
+    """
+    Lazily generates the loopless paths from s to d in order of increasing
+    number of hops, with Yen's algorithm.
+
+    The first path is the one of Network.get_shortest_path. Every further
+    path costs one restricted shortest path search per node of the
+    previous path after the node where it deviated from its parent
+    (Lawler's refinement), and is only computed when requested, so callers
+    that stop after a few paths never pay for the rest.
+
+    Parameters:
+    -----------
+    graph : Graph
+        Links of the network, every link with a positive weight is usable.
+        It must not change while the paths are generated.
+
+    s, d : int
+        Source and destination.
+
+    stats : Instrumentation
+        Counts the nodes expanded and the paths generated when given.
+
+    """
+
+    path = _shortest_path(graph, s, d, set(), set(), stats)
+
+    if len(path) == 0:
+        return
+
+    # Paths generated so far, and candidates ordered by hops then by higher node indices.
+    found = [path]
+    seen = {tuple(path)}
+    candidates = []
+
+    # Index of the node where the path deviates from the path it was derived from.
+    deviation = 0
+
+    while True:
+
+        if stats is not None:
+            stats.count("paths_enumerated")
+
+        yield list(path)
+
+        # Spurs before the deviation were already searched from the parent path.
+        for i in range(deviation, len(path) - 1):
+
+            root = path[:i + 1]
+
+            # Links leaving the root on the paths that share it.
+            blocked_links = set()
+
+            for other in found:
+
+                if other[:i + 1] == root:
+                    blocked_links.add((min(other[i], other[i + 1]), max(other[i], other[i + 1])))
+
+            spur = _shortest_path(graph, path[i], d, set(root[:-1]), blocked_links, stats)
+
+            if len(spur) == 0:
+                continue
+
+            candidate = root[:-1] + spur
+
+            if tuple(candidate) not in seen:
+                seen.add(tuple(candidate))
+
+                heapq.heappush(candidates, (len(candidate), [-v for v in candidate], candidate, i))
+
+        if len(candidates) == 0:
+            return
+
+        _, _, path, deviation = heapq.heappop(candidates)
+
+        found.append(path)
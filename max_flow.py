@@ -0,0 +1,168 @@
+
+def _level_graph(residual, s, d):
+    """
+    Returns the breadth-first levels of the nodes reachable from s in the
+    residual network, or None when d is unreachable.
+    """
+
+    level = [-1] * len(residual)
+    level[s] = 0
+
+    frontier = [s]
+
+    while len(frontier) > 0 and level[d] == -1:
+
+        next_frontier = []
+
+        for u in frontier:
+
+            for v, capacity in residual[u].items():
+
+                if capacity > 0 and level[v] == -1:
+                    level[v] = level[u] + 1
+                    next_frontier.append(v)
+
+        frontier = next_frontier
+
+    if level[d] == -1:
+        return None
+
+    return level
+
+def _blocking_flow(residual, level, s, d):
+    """
+    Saturates the level graph with augmenting paths and returns the flow
+    pushed.
+    """
+
+    neighbors = [list(row) for row in residual]
+
+    # Next neighbor to try for each node.
+    pos = [0] * len(residual)
+
+    total = 0
+
+    while True:
+
+        path = [s]
+
+        # Advance along the level graph, retreating from dead ends.
+        while len(path) > 0 and path[-1] != d:
+
+            u = path[-1]
+
+            while pos[u] < len(neighbors[u]):
+
+                v = neighbors[u][pos[u]]
+
+                if residual[u][v] > 0 and level[v] == level[u] + 1:
+                    break
+
+                pos[u] += 1
+
+            if pos[u] < len(neighbors[u]):
+                path.append(neighbors[u][pos[u]])
+
+            else:
+                path.pop()
+
+                if len(path) > 0:
+                    pos[path[-1]] += 1
+
+        if len(path) == 0:
+            return total
+
+        bottleneck = min(residual[u][v] for u, v in zip(path, path[1:]))
+
+        for u, v in zip(path, path[1:]):
+            residual[u][v] -= bottleneck
+            residual[v][u] += bottleneck
+
+        total += bottleneck
+
+def max_flow(graph, s, d):
+    """
+    Computes the maximum flow from s to d with Dinic's algorithm.
+
+    Each link of the undirected graph carries at most its weight in either
+    direction. Returns the flow value and the residual capacities as one
+    dictionary per node.
+    """
+
+    residual = [dict(graph.row(u)) for u in range(len(graph))]
+
+    value = 0
+
+    while True:
+
+        level = _level_graph(residual, s, d)
+
+        if level is None:
+            return value, residual
+
+        value += _blocking_flow(residual, level, s, d)
+
+def max_flow_paths(graph, s, d):
+    """
+    Returns a maximum set of paths from s to d such that no link is used by
+    more paths than its weight.
+
+    The number of paths is the largest k any schedule can reach for the SD
+    pair alone.
+    """
+
+    value, residual = max_flow(graph, s, d)
+
+    # Net flow carried by each link in its direction of travel.
+    flow = [{} for _ in range(len(graph))]
+
+    for u in range(len(graph)):
+
+        for v, weight in graph.row(u).items():
+
+            if weight - residual[u][v] > 0:
+                flow[u][v] = weight - residual[u][v]
+
+    paths = []
+
+    while len(paths) < value:
+
+        parent = {s: None}
+        frontier = [s]
+
+        # Breadth-first search for a simple path through the links carrying flow.
+        while len(frontier) > 0 and d not in parent:
+
+            next_frontier = []
+
+            for u in frontier:
+
+                for v in flow[u]:
+
+                    if v not in parent:
+                        parent[v] = u
+                        next_frontier.append(v)
+
+            frontier = next_frontier
+
+        path = [d]
+
+        while path[-1] != s:
+            path.append(parent[path[-1]])
+
+        path.reverse()
+
+        bottleneck = min(flow[u][v] for u, v in zip(path, path[1:]))
+        bottleneck = min(bottleneck, value - len(paths))
+
+        for u, v in zip(path, path[1:]):
+
+            flow[u][v] -= bottleneck
+
+            if flow[u][v] == 0:
+                del flow[u][v]
+
+        for _ in range(bottleneck):
+            paths.append(list(path))
+
+    return paths
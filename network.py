@@ -1,5 +1,9 @@
 
 from node import Node
+from graph import Graph
+from topologies import TOPOLOGIES
+from k_shortest_paths import shortest_paths
+import numpy as np
 import random
 import math
 
@@ -8,9 +12,55 @@ class Network:
     def __init__(self):
 
         self.nodes = []
-        self.network = []
+        self.network = Graph()
         self.paths = []
 
+        # Instrumentation of the run, disabled when None.
+        self.stats = None
+
+        # Nodes and qubit arrays kept across reset for reuse.
+        self.node_pool = []
+        self.peer_nodes = np.empty(0, dtype=np.int64)
+        self.peer_qubits = np.empty(0, dtype=np.int64)
+
+    def reset(self):
+        """
+        Clears the network for a new trial.
+
+        The nodes, the adjacency dictionaries and the qubit arrays are kept
+        and reinitialized in place by the next build_network, assign_qubits
+        and entangle_qubits_in_network, so a sweep reusing one Network does
+        not allocate them for every trial. Objects returned for the previous
+        trial, like the nodes and the network graph, are overwritten.
+        """
+
+        self.nodes = []
+        self.paths = []
+
+    def get_qubit_buffers(self, num_qubits):
+        """
+        Returns the network-wide peer node and peer qubit arrays of
+        num_qubits entries, filled with -1, that the nodes view into.
+
+        The arrays are views into buffers that only grow, by doubling, when
+        a trial has more qubits than any previous one.
+        """
+
+        if len(self.peer_nodes) < num_qubits:
+
+            size = max(num_qubits, 2 * len(self.peer_nodes))
+
+            self.peer_nodes = np.empty(size, dtype=np.int64)
+            self.peer_qubits = np.empty(size, dtype=np.int64)
+
+        peer_nodes = self.peer_nodes[:num_qubits]
+        peer_qubits = self.peer_qubits[:num_qubits]
+
+        peer_nodes.fill(-1)
+        peer_qubits.fill(-1)
+
+        return peer_nodes, peer_qubits
+
     def get_network(self):
         """
         Returns the network.
@@ -37,26 +87,14 @@ class Network:
         Returns the number of neighbors.
         """
 
-        return len(self.get_neighbor_names(node_name))
+        return self.network.degree(node_name)
 
     def get_neighbor_names(self, node_name):
         """
         Returns the names of the neighbor nodes.
         """
 
-        # Initialize the neighbor nodes list.
-        neighbor_nodes = []
-
-        # Get the link information for the node.
-        node_map = self.network[node_name]
-
-        for node, link in enumerate(node_map):
-
-            # Append the node if there is a link.
-            if link == 1:
-                neighbor_nodes.append(node)
-
-        return neighbor_nodes
+        return sorted(self.network.neighbors(node_name))
 
     def get_node_neighbors(self, node_name):
         """
@@ -74,166 +112,241 @@ class Network:
 
         return neighbors
 
-    def build_network(self, min_nodes=4, max_nodes=8, min_links=-1):
+    def build_network(self, min_nodes=4, max_nodes=8, min_links=-1, rng=None):
         """
         Randomly generates the network.
+
+        Every pair of nodes is linked with probability 1/2. Nodes missing
+        min_links or more links afterwards are linked to randomly chosen
+        nodes until they miss min_links - 1, counting the node itself.
+
+        Parameters:
+        -----------
+        min_nodes, max_nodes : int
+            Range of the number of nodes.
+
+        min_links : int
+            Number of missing links that triggers the repair. Defaults to
+            75% of the number of nodes.
+
+        rng : numpy.random.Generator
+            Source of randomness. A fresh unseeded generator when None.
+
         """
 
-        # print('Min Links:', min_links)
+        if rng is None:
+            rng = np.random.default_rng()
 
-        num_nodes = random.randint(min_nodes, max_nodes)
+        num_nodes = int(rng.integers(min_nodes, max_nodes, endpoint=True))
 
         if min_links == -1:
             min_links = math.ceil(0.75 * num_nodes)
 
-        # Initialize the network with no links.
-        for i in range(num_nodes):
-
-            node = []
+        # Randomly assign links between nodes in the upper triangle and mirror them.
+        us, vs = np.triu_indices(num_nodes, k=1)
+        links = rng.random(len(us)) < 0.5
 
-            for j in range(num_nodes):
-                node.append(-1)
+        adjacency = np.zeros((num_nodes, num_nodes), dtype=bool)
+        adjacency[us[links], vs[links]] = True
+        adjacency |= adjacency.T
 
-            self.network.append(node)
+        # Number of links each node is missing to reach the minimum degree.
+        min_degree = min(num_nodes - min_links + 1, num_nodes - 1)
+        deficit = min_degree - adjacency.sum(axis=1)
 
-        # Randomly assign links between nodes.
-        for i in range(num_nodes):
+        deficient = np.flatnonzero(deficit > 0)
 
-            zero_count = 0
-            assigned = []
+        if len(deficient) > 0:
 
-            for j in range(num_nodes):
+            # Rank the unlinked nodes of each deficient node in random order.
+            keys = rng.random((len(deficient), num_nodes))
+            keys[adjacency[deficient]] = np.inf
+            keys[np.arange(len(deficient)), deficient] = np.inf
 
-                if i == j:
-                    self.network[i][j] = 0
+            ranks = np.argsort(keys, axis=1)[:, :deficit[deficient].max()]
+            chosen = np.arange(ranks.shape[1]) < deficit[deficient][:, None]
 
-                    zero_count += 1
+            rows = np.repeat(deficient, chosen.sum(axis=1))
+            cols = ranks[chosen]
 
-                elif self.network[i][j] == -1:
+            adjacency[rows, cols] = True
+            adjacency[cols, rows] = True
 
-                    link = random.randint(0, 1)
+        us, vs = np.nonzero(np.triu(adjacency, k=1))
 
-                    self.network[i][j] = link
-                    self.network[j][i] = link
+        self.network.set_edges(num_nodes, us, vs)
 
-                    if link == 0:
-                        zero_count += 1
+        return self.network
 
+    def build_topology(self, topology, num_nodes, rng=None, **params):
+        """
+        Generates the network from one of the sparse topology generators.
 
-            # print('Zero Count:', zero_count)
-            if zero_count > min_links:
+        Parameters:
+        -----------
+        topology : string
+            Name of the generator, one of topologies.TOPOLOGIES.
 
-                one_count = zero_count - min_links + 1
+        num_nodes : int
+            Number of nodes.
 
-                while one_count > 0:
+        rng : numpy.random.Generator
+            Source of randomness. A fresh unseeded generator when None.
 
-                    node_id = random.randint(0, num_nodes - 1)
+        params : dict
+            Keyword arguments of the generator.
 
-                    if node_id not in assigned:
+        """
 
-                        assigned.append(node_id)
-                        self.network[i][node_id] = 1
-                        self.network[node_id][i] = 1
+        if topology not in TOPOLOGIES:
+            raise ValueError("Unknown topology %r, expected one of %s" % (topology, ", ".join(TOPOLOGIES)))
 
-                        one_count -= 1
+        if rng is None:
+            rng = np.random.default_rng()
 
-        # self.print_network(self.network)
+        self.network = TOPOLOGIES[topology](num_nodes, rng=rng, **params)
 
         return self.network
 
     def assign_qubits(self, min_qubits=5, max_qubits=8):
         """
         Randomly assign qubits to the nodes.
+
+        The nodes of previous trials are reset and reused, and their qubit
+        arrays are views into the buffers of get_qubit_buffers.
         """
 
         # Get the number of nodes in the network.
         num_nodes = len(self.network)
 
+        num_qubits = [random.randint(min_qubits, max_qubits) for i in range(num_nodes)]
+
+        peer_nodes, peer_qubits = self.get_qubit_buffers(sum(num_qubits))
+
+        offset = 0
+
         for i in range(num_nodes):
-            self.nodes.append(Node(str(i), random.randint(min_qubits, max_qubits)))
+
+            # Reuse the node of a previous trial when there is one.
+            if i == len(self.node_pool):
+                self.node_pool.append(Node(str(i), 0, i))
+
+            self.node_pool[i].reset(num_qubits[i], peer_nodes[offset:offset + num_qubits[i]], peer_qubits[offset:offset + num_qubits[i]])
+
+            offset += num_qubits[i]
+
+        self.nodes = self.node_pool[:num_nodes]
 
     def entangle_qubits_in_network(self):
         """
-        Randomly entangle qubits with neighboring nodes.
-        """
+        Entangle qubits with neighboring nodes.
 
-        visited = []
+        Every node offers floor(num_qubits / num_neighbors) qubits to each
+        neighbor, and each link gets the smaller offer of its two ends. A node
+        with fewer qubits than neighbors offers its qubits to its higher
+        indexed neighbors in ascending order until it runs out. The qubits of
+        a node are paired in ascending order of the neighbor index.
 
-        for node in self.nodes:
-
-            # Get the node name.
-            node_name = int(node.get_node_name())
+        All links are computed at once from the edge arrays, so the stage
+        runs in time roughly linear in the number of links. The nodes must
+        not be entangled yet.
+        """
 
-            # Get number of qubits.
-            num_qubits = node.get_num_qubits()
+        num_nodes = len(self.nodes)
 
-            # Get the neighbors of the current node.
-            neighbors = self.get_node_neighbors(node_name)
+        if num_nodes == 0:
+            return
 
-            # Get the number of neighbors of the current node.
-            neighbors_count = len(neighbors)
+        num_qubits = np.array([node.get_num_qubits() for node in self.nodes], dtype=np.int64)
+        degree = np.array([self.network.degree(i) for i in range(num_nodes)], dtype=np.int64)
 
-            # Set the number of qubits each neighbor can entangle.
-            num_qubits_neighbors_can_entangle = int(math.floor(num_qubits / neighbors_count)) if neighbors_count > 0 else num_qubits
+        # Number of qubits each node offers to each of its neighbors.
+        share = np.where(degree > 0, num_qubits // np.maximum(degree, 1), num_qubits)
 
-            visited.append(node_name)
+        us, vs, _ = self.network.edge_arrays()
 
-            for neighbor in neighbors:
+        # Requested entangled pairs per link (us < vs, sorted by us then vs).
+        requested = np.where(share[us] > 0, np.minimum(share[us], share[vs]), np.where(num_qubits[us] > 0, share[vs], 0))
 
-                # Neighbor node index.
-                neighbor_node_name = int(neighbor.get_node_name())
+        # Qubits the lower end had already paired on the earlier links of its row.
+        row_start = np.searchsorted(us, us, side='left')
+        cumulative = np.cumsum(requested)
+        before = cumulative - requested - (cumulative[row_start] - requested[row_start])
 
-                if neighbor_node_name in visited:
-                    continue
+        # Only nodes with fewer qubits than neighbors can run out of qubits.
+        pairs = np.where(share[us] == 0, np.clip(num_qubits[us] - before, 0, requested), requested)
 
-                # Get number of qubits in the target node.
-                target_num_qubits = neighbor.get_num_qubits()
+        # Both directions of every link, in the order the qubits of each node are paired.
+        owners = np.concatenate([us, vs])
+        peers = np.concatenate([vs, us])
+        weights = np.concatenate([pairs, pairs])
 
-                # Get the neighbors of the target node.
-                target_neighbors_count = self.get_neighbors_count(neighbor_node_name)
+        order = np.lexsort((peers, owners))
 
-                # Number of qubits that can be entangled with the target node.
-                target_neighbor_ratio = int(math.floor(target_num_qubits / target_neighbors_count))
+        # First qubit position each direction pairs in its owner.
+        sorted_cumulative = np.cumsum(weights[order])
+        sorted_row_start = np.searchsorted(owners[order], owners[order], side='left')
 
-                for k in range(target_neighbor_ratio):
+        first_qubit = np.empty(len(order), dtype=np.int64)
+        first_qubit[order] = sorted_cumulative - weights[order] - (sorted_cumulative[sorted_row_start] - weights[order][sorted_row_start])
 
-                    if num_qubits_neighbors_can_entangle == 0 and num_qubits > 0:
-                        _ = node.entangle_qubits(neighbor)
+        # The opposite direction of each link is half the array away.
+        peer_first_qubit = np.roll(first_qubit, len(us))
 
-                    elif k < num_qubits_neighbors_can_entangle:
-                        _ = node.entangle_qubits(neighbor)
+        # Expand each direction into one entry per entangled pair.
+        offset = np.arange(weights.sum()) - np.repeat(np.cumsum(weights) - weights, weights)
+        qubit_owner = np.repeat(owners, weights)
+        qubit_pos = np.repeat(first_qubit, weights) + offset
 
-    def get_entangled_network(self):
+        # Network-wide qubit arrays that the nodes view into.
+        node_offset = np.cumsum(num_qubits) - num_qubits
 
-        node_count = len(self.nodes)
+        peer_nodes, peer_qubits = self.get_qubit_buffers(num_qubits.sum())
 
-        new_network = []
+        peer_nodes[node_offset[qubit_owner] + qubit_pos] = np.repeat(peers, weights)
+        peer_qubits[node_offset[qubit_owner] + qubit_pos] = np.repeat(peer_first_qubit, weights) + offset
 
-        for i in range(node_count):
+        for i, node in enumerate(self.nodes):
+            node.set_entanglements(peer_nodes[node_offset[i]:node_offset[i] + num_qubits[i]], peer_qubits[node_offset[i]:node_offset[i] + num_qubits[i]])
 
-            row = []
+    def get_entangled_network(self):
+        """
+        Returns the graph of the entangled links weighted by the number of
+        entangled qubit pairs.
+        """
 
-            for j in range(node_count):
+        node_count = len(self.nodes)
 
-                row.append(0)
+        if node_count == 0:
+            return Graph()
 
-            new_network.append(row)
+        # Owner and peer of every qubit in the network.
+        owners = np.repeat(np.arange(node_count), [node.get_num_qubits() for node in self.nodes])
+        peers = np.concatenate([node.get_peer_nodes() for node in self.nodes])
 
+        # Count each entangled pair once from its lower-indexed end.
+        pair_ids = owners * node_count + peers
+        pair_ids, counts = np.unique(pair_ids[owners < peers], return_counts=True)
 
-        for i in range(node_count):
+        return Graph.from_edges(node_count, pair_ids // node_count, pair_ids % node_count, counts)
 
-            entangled_qubits = self.nodes[i].get_entangled_qubits()
+    def get_link_fidelities(self, new_network, min_fidelity=0.9, max_fidelity=1.0, rng=None):
+        """
+        Returns the graph of the fidelity of the entangled pairs of every
+        link of new_network, drawn uniformly from [min_fidelity, max_fidelity).
 
-            for k, v in entangled_qubits.items():
+        The fidelities keep the links of new_network, so they can be looked
+        up for any residual graph derived from it.
+        """
 
-                if v is None:
-                    continue
+        if rng is None:
+            rng = np.random.default_rng()
 
-                linked_node = int(v.split(':')[0])
+        us, vs, _ = new_network.edge_arrays()
 
-                new_network[i][linked_node] += 1
+        fidelities = rng.uniform(min_fidelity, max_fidelity, len(us))
 
-        return new_network
+        return Graph.from_edges(len(new_network), us, vs, fidelities)
 
     def pair_exists(self, pair, pair_list):
         """
@@ -307,41 +420,30 @@ class Network:
         return sd_pairs
 
     def is_connected_network(self, network):
+        """
+        Checks that every node in the network has at least one link.
+        """
 
         for i in range(len(network)):
 
-            all_zeroes = False
-
-            for j in range(len(network)):
-
-                if network[i][j] != 0:
-                    break
-
-                if j == len(network) - 1 and network[i][j] == 0:
-                    all_zeroes = True
-
-            if all_zeroes:
+            if network.degree(i) == 0:
                 return False
 
         return True
 
     def get_adjacent_nodes(self, node_name, network):
+        """
+        Returns the adjacent nodes in descending order of their index.
+        """
 
-        nds = network[node_name]
-        adjacent_nodes = []
-
-        for node, value in enumerate(nds):
-
-            if value > 0:
-                adjacent_nodes.append(node)
-
-        adjacent_nodes.reverse()
-
-        return adjacent_nodes
+        return sorted(network.neighbors(node_name), reverse=True)
 
-    def update_network(self, path, new_network):
+    def update_network(self, path, new_network, cache=None):
         """
         Removes the entangled link in the network on the path.
+
+        The cached paths through the links that run out of entangled pairs
+        are dropped from the PathCache cache, when given.
         """
 
         for i, node in enumerate(path):
@@ -349,8 +451,16 @@ class Network:
             u = path[i]
             v = path[i + 1]
 
-            new_network[u][v] -= 1
-            new_network[v][u] -= 1
+            depleted = new_network.decrement(u, v) == 0
+
+            if depleted and cache is not None:
+                cache.invalidate_links([(u, v)])
+
+            if self.stats is not None:
+                self.stats.count("residual_updates")
+
+                if depleted:
+                    self.stats.count("links_depleted")
 
             if i == len(path) - 2:
                 break
@@ -411,44 +521,116 @@ class Network:
     #     print(paths)
     #     print(new_network)
 
-    def find_paths(self, u, d, new_network, visited, path):
+    def find_paths(self, u, d, new_network, visited, path, bounds=None):
         """
         Finds the path from u to d in the network and appends to the paths list.
+
+        The depth-first search keeps the untried neighbors of every node on
+        the path in an explicit stack instead of recursing, so the length of
+        the paths is not limited by the recursion limit. The paths are found
+        in the same order as the recursive search.
+
+        With a PathBounds for d, a neighbor is skipped as soon as the path
+        through it can no longer meet the hop or fidelity bound.
         """
 
+        expanded = 0
+        found = 0
+
+        if bounds is not None and not bounds.admits(u, len(path), 1.0):
+            return
+
+        # Werner parameter of the path up to each of its nodes.
+        werners = [1.0]
+
         # Mark the current node as visited.
         visited[u] = True
 
         # Append the current node to path list.
         path.append(u)
 
+        expanded += 1
+
+        # Untried neighbors of each node on the path, the destination is never expanded.
+        stack = []
+
         # If current node is the destination then append to the paths list.
         if u == d:
-
             self.paths.append(list(path))
 
+            found += 1
+
         else:
+            stack.append(iter(self.get_adjacent_nodes(u, new_network)))
 
-            for i in self.get_adjacent_nodes(u, new_network):
+        while len(stack) > 0:
+
+            for i in stack[-1]:
 
                 if visited[i] == False:
 
-                    self.find_paths(i, d, new_network, visited, path)
+                    if bounds is not None:
+
+                        werner = werners[-1] * bounds.link_werner(path[-1], i)
+
+                        # Prune the branch when it cannot meet the bounds.
+                        if not bounds.admits(i, len(path), werner):
+                            continue
+
+                        werners.append(werner)
+
+                    visited[i] = True
+                    path.append(i)
+
+                    expanded += 1
+
+                    # If the neighbor is the destination then append to the paths list.
+                    if i == d:
+                        self.paths.append(list(path))
+
+                        found += 1
+
+                        path.pop()
+                        visited[i] = False
+
+                        if bounds is not None:
+                            werners.pop()
 
-        # Pop current node from the path.
-        path.pop()
+                        continue
 
-        # Mark the current node as unvisited.
-        visited[u] = False
+                    stack.append(iter(self.get_adjacent_nodes(i, new_network)))
 
+                    break
+
+            else:
+                # Every neighbor is tried, pop the node from the path and mark it as unvisited.
+                stack.pop()
+
+                visited[path.pop()] = False
+
+                if bounds is not None:
+                    werners.pop()
+
+        # The destination never got a stack entry, so it is popped here.
+        if u == d:
+            path.pop()
+
+            visited[u] = False
+
+        if self.stats is not None:
+            self.stats.count("nodes_expanded", expanded)
+            self.stats.count("paths_enumerated", found)
 
-    def get_paths(self, s, d, new_network):
+    def get_paths(self, s, d, new_network, bounds=None):
         """
         Returns all path from source to destination.
+
+        With a PathBounds for d, only the paths within its hop and fidelity
+        bounds are returned.
         """
 
         # Mark all nodes as unvisited
-        visited = [False] * (len(self.nodes))
+        visited = [False] * len(new_network)
 
         # Initialize the path array.
         path = []
@@ -456,33 +638,171 @@ class Network:
         self.paths = []
 
         # Recursively find paths.
-        self.find_paths(s, d, new_network, visited, path)
+        self.find_paths(s, d, new_network, visited, path, bounds)
 
         return self.paths
 
+    def iter_shortest_paths(self, s, d, new_network):
+        """
+        Returns an iterator over the simple paths from source to destination
+        in order of increasing length.
+
+        The paths are generated lazily with Yen's algorithm, so taking the
+        first few costs a few shortest path searches instead of enumerating
+        every path like get_paths. new_network must not change while the
+        iterator is in use.
+        """
 
-    def print_network(self, nwk = None):
+        return shortest_paths(new_network, s, d, self.stats)
+
+    def get_shortest_path(self, s, d, new_network, cache=None):
         """
-        Prints the adjacency matrix of the network.
+        Returns the shortest path from source to destination.
+
+        Gives the same path as select_path(get_paths(s, d, new_network)) without
+        enumerating every simple path: ties are broken towards the neighbor
+        with the highest index at each hop. Returns an empty list when the
+        destination is unreachable.
+
+        With a PathCache, the path is looked up in and stored to the cache.
+        The links of new_network must then only be removed through
+        update_network with the same cache.
         """
 
-        num_nodes = 0
+        if cache is not None:
 
-        if nwk is None:
-            num_nodes = self.get_num_nodes()
-        else:
-            num_nodes = len(nwk)
+            path = cache.get(s, d)
 
+            if self.stats is not None:
+                self.stats.count("path_cache_hits" if path is not None else "path_cache_misses")
 
-        for i in range(num_nodes):
+            if path is not None:
+                return path
+
+        # Hop distance of each node to the destination (-1 when unlabeled).
+        dist = [-1] * len(new_network)
+        dist[d] = 0
+
+        frontier = [d]
+
+        expanded = 0
+
+        # Breadth-first search from the destination until the source's layer is complete.
+        while len(frontier) > 0 and dist[s] == -1:
+
+            expanded += len(frontier)
+
+            next_frontier = []
+
+            for u in frontier:
+
+                for v in self.get_adjacent_nodes(u, new_network):
+
+                    if dist[v] == -1:
+                        dist[v] = dist[u] + 1
+                        next_frontier.append(v)
+
+            frontier = next_frontier
 
-            for j in range(num_nodes):
+        if self.stats is not None:
+            self.stats.count("nodes_expanded", expanded)
 
-                if nwk is None:
+        if dist[s] == -1:
+
+            if cache is not None:
+                cache.put(s, d, [])
+
+            return []
+
+        path = [s]
+        u = s
+
+        # Walk down the distance labels, preferring the highest node index.
+        while u != d:
+
+            u = max(v for v in self.get_adjacent_nodes(u, new_network) if dist[v] == dist[u] - 1)
+
+            path.append(u)
+
+        if cache is not None:
+            cache.put(s, d, path)
+
+        return path
+
+
+    def get_bounded_path(self, s, d, new_network, bounds):
+        """
+        Returns the path from source to destination with the fewest hops
+        among the paths within the hop and fidelity bounds of the PathBounds
+        bounds, or an empty list when there is none.
+
+        Every hop count h keeps the largest Werner parameter of a path of h
+        links to each node, so the search is exact. The first h reaching the
+        destination within the bounds gives a simple path, as dropping a
+        cycle would reach it in fewer hops with no lower fidelity. Partial
+        paths that can no longer meet the bounds are pruned.
+        """
+
+        if not bounds.admits(s, 0, 1.0):
+            return []
+
+        # Best Werner parameter and predecessor of the nodes reached in the current number of hops.
+        layer = {s: 1.0}
+        parents = []
+
+        expanded = 0
+
+        while d not in layer and len(layer) > 0:
+
+            hops = len(parents) + 1
+
+            next_layer = {}
+            parent = {}
+
+            for u, werner in layer.items():
+
+                expanded += 1
+
+                for v in self.get_adjacent_nodes(u, new_network):
+
+                    candidate = werner * bounds.link_werner(u, v)
+
+                    if v in next_layer and candidate <= next_layer[v]:
+                        continue
+
+                    if bounds.admits(v, hops, candidate):
+                        next_layer[v] = candidate
+                        parent[v] = u
+
+            parents.append(parent)
+            layer = next_layer
+
+        if self.stats is not None:
+            self.stats.count("nodes_expanded", expanded)
+
+        if d not in layer:
+            return []
+
+        path = [d]
+
+        for parent in reversed(parents):
+            path.append(parent[path[-1]])
+
+        path.reverse()
+
+        return path
+
+    def print_network(self, nwk = None):
+        """
+        Prints the adjacency matrix of the network.
+        """
+
+        if nwk is None:
+            nwk = self.network
 
-                    print(self.network[i][j], end='\t')
+        for row in nwk.to_matrix():
 
-                else:
-                    print(nwk[i][j], end='\t')
+            for link in row:
+                print(link, end='\t')
 
             print('')
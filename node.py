@@ -1,9 +1,12 @@
 
+import numpy as np
 import json
 
 class Node:
 
-    def __init__(self, name, num_qubits):
+    __slots__ = ('name', 'index', 'num_qubits', 'num_entangled_qubits', 'qubit_pos', 'peer_nodes', 'peer_qubits')
+
+    def __init__(self, name, num_qubits, index=None):
         """
         The entangled qubits are represented as follows:
 
@@ -15,6 +18,10 @@ class Node:
         num_qubits : int
             Number of qubits in the node.
 
+        index : int
+            Position of the node in the network. Defaults to int(name), which
+            matches the names given by Network.assign_qubits.
+
         Description:
         --------------
         num_entangled_qubits : int
@@ -23,41 +30,63 @@ class Node:
         qubit_pos : int
             Qubit position of the unentangled qubit.
 
-        entangled_qubits : dict
-            Dictionary mapping for entangled nodes.
+        peer_nodes : numpy.ndarray
+            Index of the node each qubit is entangled with, -1 when the qubit
+            is not entangled.
 
-            The identifier is represented as follows:
-                "srcNode:srcNodeQubitPos": "targetNode:targetNodeQubitPos"
+        peer_qubits : numpy.ndarray
+            Qubit position in the peer node each qubit is entangled with, -1
+            when the qubit is not entangled.
 
             For Example:
-                If A is the source node (with 2 Qubits) and B is the target node
-                (with 4 Qubits). Suppose, the 2nd qubit in A is entangled with
-                4th qubit in B then it is represented as follows:
+                If A (index 0, with 2 Qubits) is the source node and B (index
+                1, with 4 Qubits) is the target node. Suppose, the 2nd qubit
+                in A is entangled with 4th qubit in B then it is represented
+                as follows:
 
                 In "A":
-                    {
-                        "A:0": None,
-                        "A:1": "B:3"
-                    }
+                    peer_nodes:  [-1,  1]
+                    peer_qubits: [-1,  3]
 
                 In "B":
-                    {
-                        "B:0": None,
-                        "B:1": None,
-                        "B:0": None,
-                        "B:3": "A:1",
-                    }
+                    peer_nodes:  [-1, -1, -1,  0]
+                    peer_qubits: [-1, -1, -1,  1]
 
         """
 
         self.name = name
+        self.index = int(name) if index is None else index
+
+        self.reset(num_qubits)
+
+    def reset(self, num_qubits, peer_nodes=None, peer_qubits=None):
+        """
+        Reinitializes the node with num_qubits unentangled qubits, so the
+        same object can be reused for another trial.
+
+        Parameters:
+        -----------
+        num_qubits : int
+            Number of qubits in the node.
+
+        peer_nodes, peer_qubits : numpy.ndarray
+            Preallocated arrays of num_qubits entries, filled with -1, to use
+            as the entanglements of the qubits. New arrays are allocated when
+            None.
+
+        """
+
+        if peer_nodes is None:
+            peer_nodes = np.full(num_qubits, -1, dtype=np.int64)
+
+        if peer_qubits is None:
+            peer_qubits = np.full(num_qubits, -1, dtype=np.int64)
+
         self.num_qubits = num_qubits
         self.num_entangled_qubits = 0
         self.qubit_pos = 0
-        self.entangled_qubits = {}
-
-        for i in range(self.num_qubits):
-            self.entangled_qubits[str(self.name) + ":" + str(i)] = None
+        self.peer_nodes = peer_nodes
+        self.peer_qubits = peer_qubits
 
     def get_node_name(self):
         """
@@ -66,6 +95,13 @@ class Node:
 
         return self.name
 
+    def get_index(self):
+        """
+        Returns the position of the node in the network.
+        """
+
+        return self.index
+
     def get_num_qubits(self):
         """
         Returns the number of qubits.
@@ -73,13 +109,6 @@ class Node:
 
         return self.num_qubits
 
-    # def _increment_qubit_pos(self):
-    #     """
-    #     Increments the qubit pos.
-    #     """
-
-    #     self.qubit_pos += 1
-
     def entangle_qubits(self, target, src_qubit_pos=None, target_qubit_pos=None):
         """
         Entangles qubits in source and target.
@@ -102,23 +131,17 @@ class Node:
         if self.get_num_entangled_qubits() < self.get_num_qubits() and target.get_num_entangled_qubits() < target.get_num_qubits():
 
             if src_qubit_pos is None or target_qubit_pos is None:
-                # src_qubit_pos = self.qubit_pos
-                # target_qubit_pos = target.qubit_pos
 
                 src_qubit_pos = self.get_num_entangled_qubits()
                 target_qubit_pos = target.get_num_entangled_qubits()
 
-            src_id = self.name + ":" + str(src_qubit_pos)
-            target_id = target.get_node_name() + ":" + str(target_qubit_pos)
-
             self.increment_entangled_qubits()
             target.increment_entangled_qubits()
 
-            self.entangled_qubits[src_id] = target_id
-            target.entangled_qubits[target_id] = src_id
-
-            # self._increment_qubit_pos()
-            # target._increment_qubit_pos()
+            self.peer_nodes[src_qubit_pos] = target.get_index()
+            self.peer_qubits[src_qubit_pos] = target_qubit_pos
+            target.peer_nodes[target_qubit_pos] = self.get_index()
+            target.peer_qubits[target_qubit_pos] = src_qubit_pos
 
         else:
             return False
@@ -139,9 +162,58 @@ class Node:
 
         return self.num_entangled_qubits
 
+    def get_peer_nodes(self):
+        """
+        Returns the index of the node each qubit is entangled with.
+        """
+
+        return self.peer_nodes
+
+    def get_peer_qubits(self):
+        """
+        Returns the qubit position in the peer node each qubit is entangled with.
+        """
+
+        return self.peer_qubits
+
+    def set_entanglements(self, peer_nodes, peer_qubits):
+        """
+        Replaces the entanglements of all the qubits at once.
+
+        Parameters:
+        -----------
+        peer_nodes : numpy.ndarray
+            Index of the node each qubit is entangled with, -1 when the qubit
+            is not entangled.
+        peer_qubits : numpy.ndarray
+            Qubit position in the peer node each qubit is entangled with.
+
+        """
+
+        self.peer_nodes = peer_nodes
+        self.peer_qubits = peer_qubits
+        self.num_entangled_qubits = int(np.count_nonzero(peer_nodes != -1))
+
     def get_entangled_qubits(self):
+        """
+        Returns the entanglements as a dictionary mapping "node:qubitPos" of
+        each qubit to "peerNode:peerQubitPos", or None when the qubit is not
+        entangled. Nodes are identified by their index.
+        """
+
+        entangled_qubits = {}
 
-        return self.entangled_qubits
+        for i in range(self.num_qubits):
+
+            src_id = str(self.index) + ":" + str(i)
+
+            if self.peer_nodes[i] == -1:
+                entangled_qubits[src_id] = None
+
+            else:
+                entangled_qubits[src_id] = str(self.peer_nodes[i]) + ":" + str(self.peer_qubits[i])
+
+        return entangled_qubits
 
     def print_info(self):
         """
@@ -150,6 +222,5 @@ class Node:
 
         print('Node:', self.name)
         print('Number of qubits:', self.num_qubits)
-        print('Entangled Qubits:\n', json.dumps(self.entangled_qubits, indent=4), sep='')
+        print('Entangled Qubits:\n', json.dumps(self.get_entangled_qubits(), indent=4), sep='')
         print('Number of Entangled Qubits:', self.get_num_entangled_qubits())
-
@@ -0,0 +1,111 @@
+
+from collections import OrderedDict
+
+class PathCache:
+
+    def __init__(self, max_size=4096):
+        """
+        Least recently used cache of shortest paths in a residual graph.
+
+        Parameters:
+        -----------
+        max_size : int
+            Maximum number of cached SD pairs.
+
+        Description:
+        --------------
+        paths : OrderedDict
+            (s, d) mapped to the cached path, least recently used first. An
+            empty path means d was unreachable from s.
+
+        link_keys : dict
+            Link (u, v) with u < v mapped to the SD pairs whose cached path
+            uses it.
+
+            Links are only ever removed from a residual graph, so distances
+            can only grow and the shortest paths can only disappear. A cached
+            path therefore remains the shortest, with the same tie-break,
+            until one of its own links is depleted. Links must not be added
+            to the graph while the cache is in use.
+
+        """
+
+        self.max_size = max_size
+        self.paths = OrderedDict()
+        self.link_keys = {}
+
+    def __len__(self):
+        """
+        Returns the number of cached SD pairs.
+        """
+
+        return len(self.paths)
+
+    def get(self, s, d):
+        """
+        Returns the cached path from s to d, or None when it is not cached.
+        """
+
+        key = (s, d)
+
+        if key not in self.paths:
+            return None
+
+        self.paths.move_to_end(key)
+
+        return self.paths[key]
+
+    def put(self, s, d, path):
+        """
+        Caches the path from s to d, evicting the least recently used path
+        when the cache is full.
+        """
+
+        key = (s, d)
+
+        if key in self.paths:
+            self._remove(key)
+
+        self.paths[key] = path
+
+        for u, v in zip(path, path[1:]):
+            self.link_keys.setdefault((min(u, v), max(u, v)), set()).add(key)
+
+        while len(self.paths) > self.max_size:
+            self._remove(next(iter(self.paths)))
+
+    def _remove(self, key):
+        """
+        Drops a cached path and its link references.
+        """
+
+        path = self.paths.pop(key)
+
+        for u, v in zip(path, path[1:]):
+
+            link = (min(u, v), max(u, v))
+            keys = self.link_keys.get(link)
+
+            if keys is not None:
+                keys.discard(key)
+
+                if len(keys) == 0:
+                    del self.link_keys[link]
+
+    def invalidate_links(self, links):
+        """
+        Drops the cached paths that use any of the depleted links.
+        """
+
+        for u, v in links:
+
+            for key in list(self.link_keys.get((min(u, v), max(u, v)), ())):
+                self._remove(key)
+
+    def clear(self):
+        """
+        Drops every cached path.
+        """
+
+        self.paths.clear()
+        self.link_keys.clear()
@@ -0,0 +1,211 @@
+
+from graph import Graph
+
+class ResidualGraph:
+
+    def __init__(self, base):
+        """
+        Copy-on-write view of the residual capacities of a graph.
+
+        The view reads the adjacency dictionaries of a shared base graph and
+        copies the dictionary of a node the first time one of its links
+        changes, so creating it costs O(1) and its memory grows with the
+        nodes whose links are consumed. It has the methods of Graph that the
+        schedulers use and can replace a copy of the base.
+
+        Parameters:
+        -----------
+        base : Graph
+            Graph shared by the views, read through its adjacency
+            dictionaries. It must not change while they are in use.
+
+        Description:
+        --------------
+        rows : dict
+            Node mapped to its adjacency dictionary, for the nodes whose
+            links changed. Links with weight 0 are not stored, like in
+            Graph.adj.
+
+        owned : set
+            Nodes whose dictionary in rows belongs to this view alone. The
+            other dictionaries are shared with a fork and are copied before
+            the first write.
+
+        shared : bool
+            Whether rows itself is shared with a fork. Forking marks both
+            views, so it costs O(1), and each copies rows before its next
+            write.
+
+        """
+
+        self.base = base
+        self.rows = {}
+        self.owned = set()
+        self.shared = False
+
+    def __len__(self):
+        """
+        Returns the number of nodes in the graph.
+        """
+
+        return len(self.base)
+
+    def fork(self):
+        """
+        Returns an independent view with the same weights, in O(1).
+        """
+
+        graph = ResidualGraph(self.base)
+        graph.rows = self.rows
+        graph.shared = True
+
+        self.owned = set()
+        self.shared = True
+
+        return graph
+
+    def _own_row(self, u):
+        """
+        Returns the adjacency dictionary of the node, copied first unless
+        this view already owns it.
+        """
+
+        if self.shared:
+            self.rows = dict(self.rows)
+            self.shared = False
+
+        if u not in self.owned:
+            self.rows[u] = dict(self.row(u))
+            self.owned.add(u)
+
+        return self.rows[u]
+
+    def get_weight(self, u, v):
+        """
+        Returns the weight of the link between u and v.
+        """
+
+        return self.row(u).get(v, 0)
+
+    def has_edge(self, u, v):
+        """
+        Checks if there is a link between u and v.
+        """
+
+        return self.get_weight(u, v) > 0
+
+    def set_weight(self, u, v, weight):
+        """
+        Sets the weight of the link between u and v. A weight of 0 or less
+        removes the link.
+        """
+
+        if weight > 0:
+            self._own_row(u)[v] = weight
+            self._own_row(v)[u] = weight
+
+        else:
+            self._own_row(u).pop(v, None)
+            self._own_row(v).pop(u, None)
+
+    def add_edge(self, u, v, weight=1):
+        """
+        Adds the weight to the link between u and v.
+        """
+
+        self.set_weight(u, v, self.get_weight(u, v) + weight)
+
+    def decrement(self, u, v, amount=1):
+        """
+        Decrements the weight of the link between u and v and returns the new
+        weight.
+        """
+
+        weight = max(self.get_weight(u, v) - amount, 0)
+
+        self.set_weight(u, v, weight)
+
+        return weight
+
+    def row(self, u):
+        """
+        Returns the dictionary mapping the neighbors of the node to the link
+        weights. It must not be modified.
+        """
+
+        row = self.rows.get(u)
+
+        # Nodes without changes read the base directly.
+        if row is None:
+            return self.base.adj[u]
+
+        return row
+
+    def neighbors(self, u):
+        """
+        Returns the neighbors of the node in no particular order.
+        """
+
+        row = self.rows.get(u)
+
+        if row is None:
+            return self.base.adj[u].keys()
+
+        return row.keys()
+
+    def degree(self, u):
+        """
+        Returns the number of neighbors of the node.
+        """
+
+        return len(self.row(u))
+
+    def edges(self):
+        """
+        Yields each link once as a (u, v, weight) tuple with u <= v.
+        """
+
+        for u in range(len(self)):
+
+            for v, weight in self.row(u).items():
+
+                if u <= v:
+                    yield (u, v, weight)
+
+    def num_edges(self):
+        """
+        Returns the number of links in the graph.
+        """
+
+        return sum(1 for _ in self.edges())
+
+    def copy(self):
+        """
+        Returns the residual capacities as a standalone Graph.
+        """
+
+        graph = Graph()
+        graph.adj = [dict(self.row(u)) for u in range(len(self))]
+
+        return graph
+
+    def edge_arrays(self):
+        """
+        Returns the links as arrays (us, vs, weights), like Graph.edge_arrays.
+        """
+
+        return self.copy().edge_arrays()
+
+    def to_csr(self):
+        """
+        Returns the graph in compressed sparse row form, like Graph.to_csr.
+        """
+
+        return self.copy().to_csr()
+
+    def to_matrix(self):
+        """
+        Returns the dense adjacency matrix as a list of lists.
+        """
+
+        return self.copy().to_matrix()
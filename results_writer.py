@@ -0,0 +1,101 @@
+
+import csv
+import os
+
+class ResultsWriter:
+
+    def __init__(self, path, columns, resume=False, flush_every=1):
+        """
+        Appends results rows to a CSV file as they complete.
+
+        Parameters:
+        -----------
+        path : string
+            Path of the CSV file.
+
+        columns : list
+            Column names, written as the header.
+
+        resume : bool
+            Keeps the rows already in the file and appends after them.
+            Otherwise the file is overwritten.
+
+        flush_every : int
+            Number of rows written between flushes to the file.
+
+        Description:
+        --------------
+        num_rows : int
+            Number of rows in the file, including the ones kept on resume.
+            Runs that produce their rows in a fixed order resume by skipping
+            the first num_rows cells.
+
+        """
+
+        self.path = path
+        self.columns = list(columns)
+        self.flush_every = flush_every
+        self.num_rows = 0
+        self.pending = 0
+
+        if resume and os.path.exists(path) and os.path.getsize(path) > 0:
+
+            with open(path, newline='') as f:
+
+                reader = csv.reader(f)
+
+                header = next(reader)
+
+                if header != self.columns:
+                    raise ValueError("Cannot resume %s, its columns %s differ from %s" % (path, header, self.columns))
+
+                for _ in reader:
+                    self.num_rows += 1
+
+            self.file = open(path, 'a', newline='')
+            self.writer = csv.writer(self.file)
+
+        else:
+            self.file = open(path, 'w', newline='')
+            self.writer = csv.writer(self.file)
+
+            self.writer.writerow(self.columns)
+            self.file.flush()
+
+    def write(self, row):
+        """
+        Appends a row given as a dictionary keyed by column.
+        """
+
+        self.writer.writerow([row[column] for column in self.columns])
+
+        self.num_rows += 1
+        self.pending += 1
+
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """
+        Flushes the written rows to the file.
+        """
+
+        self.file.flush()
+
+        self.pending = 0
+
+    def close(self):
+        """
+        Flushes and closes the file.
+        """
+
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+
+        self.close()
@@ -1,142 +1,482 @@
 
 from network import Network
-from utils import select_path, copy_graph, get_labels
-import numpy as np
-import networkx as nx
-import pandas as pd
-import matplotlib.pyplot as plt
+from shortest_path_tree import ShortestPathTree
+from max_flow import max_flow_paths
+from disjoint_paths import disjoint_paths, is_unit_capacity
+from fidelity import PathBounds
+from snapshot import save_snapshot
+from results_writer import ResultsWriter
+from path_cache import PathCache
+from instrumentation import Instrumentation, INSTRUMENTATION_COLUMNS, stage_timer
+from utils import copy_graph, get_k
+from concurrent.futures import ThreadPoolExecutor
+import heapq
 import math
 import random
 import traceback
 
 def sequential_multipath_scheduling(D, network, graph):
+    """
+    Repeatedly assigns the shortest remaining path to the SD pair with the
+    fewest paths so far, until no SD pair can be served anymore.
 
-    queue = []
+    Ties go to the SD pair that comes first in D, so the SD pairs are served
+    round-robin.
+
+    A single SD pair on links that each hold one entangled pair is scheduled
+    with disjoint_multipath_scheduling instead, since the greedy can then
+    block links that a larger set of edge-disjoint paths needs.
+
+    Returns:
+    --------
+    Dictionary mapping each SD pair to the list of its paths.
+
+    """
+
+    if len(D) == 1 and is_unit_capacity(graph):
+        return disjoint_multipath_scheduling(D, network, graph)
+
+    # Final demands.
+    demands = {}
+
+    # SD pairs still served, keyed on their number of paths and their position in D.
+    heap = []
+
+    # Distances to each destination, repaired as the links get depleted.
+    trees = {}
+
+    # Paths stay valid until one of their links gets depleted.
+    cache = PathCache()
+
+    for i, sd in enumerate(D):
+        demands[sd] = []
+        heap.append((0, i, sd))
+
+        if sd[1] not in trees:
+            trees[sd[1]] = ShortestPathTree(graph, sd[1], network.stats)
+
+    heapq.heapify(heap)
+
+    while len(heap) > 0:
+
+        num_paths, i, sd_pair = heapq.heappop(heap)
+
+        if network.stats is not None:
+            network.stats.count("rounds")
+
+        s = sd_pair[0]
+        d = sd_pair[1]
+
+        path = cache.get(s, d)
+
+        if network.stats is not None:
+            network.stats.count("path_cache_hits" if path is not None else "path_cache_misses")
+
+        if path is None:
+            path = trees[d].get_path(s)
+
+            cache.put(s, d, path)
+
+        if len(path) > 0:
+
+            graph = network.update_network(path, graph, cache)
+
+            # Links on the path that ran out of entangled pairs.
+            depleted = [(u, v) for u, v in zip(path, path[1:]) if not graph.has_edge(u, v)]
+
+            if len(depleted) > 0:
+
+                for tree in trees.values():
+                    tree.remove_links(depleted)
+
+            demands[sd_pair].append(list(path))
+
+            heapq.heappush(heap, (num_paths + 1, i, sd_pair))
+
+    return demands
+
+def max_flow_multipath_scheduling(D, network, graph):
+    """
+    Schedules the demands from a maximum flow decomposition instead of
+    repeatedly extracting shortest paths.
+
+    For a single SD pair the result is the largest k reachable. Several SD
+    pairs are served one after another on the remaining links.
+
+    Returns:
+    --------
+    Dictionary mapping each SD pair to the list of its paths.
+
+    """
+
+    # Final demands.
+    demands = {}
+
+    for sd in D:
+
+        demands[sd] = []
+
+        if network.stats is not None:
+            network.stats.count("rounds")
+
+        for path in max_flow_paths(graph, sd[0], sd[1]):
+
+            graph = network.update_network(path, graph)
+
+            demands[sd].append(path)
+
+    return demands
+
+def disjoint_multipath_scheduling(D, network, graph):
+    """
+    Schedules each SD pair on the most paths its remaining links allow,
+    with the fewest total hops, using Bhandari's disjoint paths algorithm.
+
+    On links that each hold one entangled pair, the paths of an SD pair are
+    its largest set of shortest edge-disjoint paths. Several SD pairs are
+    served one after another on the remaining links.
+
+    Returns:
+    --------
+    Dictionary mapping each SD pair to the list of its paths.
+
+    """
 
     # Final demands.
     demands = {}
 
     for sd in D:
+
         demands[sd] = []
-        queue.append(sd)
 
-    while len(queue) > 0:
+        if network.stats is not None:
+            network.stats.count("rounds")
+
+        for path in disjoint_paths(graph, sd[0], sd[1], stats=network.stats):
+
+            graph = network.update_network(path, graph)
+
+            demands[sd].append(path)
+
+    return demands
+
+def concurrent_multipath_scheduling(D, network, graph, workers=None):
+    """
+    Assigns a path to every SD pair still served in each round, instead of
+    one SD pair at a time.
+
+    Every round, the candidate paths of all the SD pairs are read from the
+    shortest path trees of the same residual graph, which is left untouched
+    until the round commits. Candidates are then committed in the order of
+    sequential_multipath_scheduling, fewest paths first and ties to the SD
+    pair first in D. A candidate that needs a link already used up by the
+    candidates committed before it is dropped, and its SD pair tries again
+    next round on the updated links. SD pairs without a path are done.
+
+    Parameters:
+    -----------
+    workers : int
+        Number of threads reading the candidates. They are read in the
+        calling thread when None.
+
+    Returns:
+    --------
+    Dictionary mapping each SD pair to the list of its paths.
+
+    """
+
+    # Final demands.
+    demands = {}
+
+    # Distances to each destination, repaired once per round.
+    trees = {}
+
+    # SD pairs still served, with their position in D.
+    pending = []
+
+    for i, sd in enumerate(D):
+        demands[sd] = []
+        pending.append((i, sd))
 
-        sd_pair = queue[0]
-        queue.pop(0)
+        if sd[1] not in trees:
+            trees[sd[1]] = ShortestPathTree(graph, sd[1], network.stats)
+
+    def candidate(entry):
+        return trees[entry[1][1]].get_path(entry[1][0])
+
+    pool = ThreadPoolExecutor(workers) if workers is not None else None
+
+    try:
+        while len(pending) > 0:
+
+            if network.stats is not None:
+                network.stats.count("rounds")
+
+            # The trees are read-only while the candidates are searched.
+            if pool is None:
+                candidates = [candidate(entry) for entry in pending]
+            else:
+                candidates = list(pool.map(candidate, pending))
+
+            # Entangled pairs left on the links claimed by the committed candidates.
+            remaining = {}
+
+            committed = []
+            retry = []
+
+            for (i, sd), path in sorted(zip(pending, candidates), key=lambda item: (len(demands[item[0][1]]), item[0][0])):
+
+                if len(path) == 0:
+                    continue
+
+                links = [(min(u, v), max(u, v)) for u, v in zip(path, path[1:])]
+
+                if any(remaining.get(link, graph.get_weight(*link)) == 0 for link in links):
+                    retry.append((i, sd))
+                    continue
+
+                for link in links:
+                    remaining[link] = remaining.get(link, graph.get_weight(*link)) - 1
+
+                committed.append((i, sd))
+
+                demands[sd].append(list(path))
+
+                graph = network.update_network(path, graph)
+
+            depleted = [link for link, pairs in remaining.items() if pairs == 0]
+
+            if len(depleted) > 0:
+
+                for tree in trees.values():
+                    tree.remove_links(depleted)
+
+            pending = sorted(committed + retry)
+
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return demands
+
+def bounded_multipath_scheduling(D, network, graph, max_hops=None, fidelities=None, min_fidelity=None):
+    """
+    Schedules like sequential_multipath_scheduling, but only with paths of
+    at most max_hops links and at least min_fidelity end-to-end fidelity.
+
+    Each round gives the SD pair with the fewest paths its path with the
+    fewest hops within the bounds, from Network.get_bounded_path, so paths
+    too long or too noisy to be useful are never counted in k.
+
+    Parameters:
+    -----------
+    max_hops : int
+        Maximum number of links of a path. Unbounded when None.
+
+    fidelities : Graph
+        Fidelity of every link, from Network.get_link_fidelities.
+
+    min_fidelity : float
+        Minimum end-to-end fidelity of a path. Unbounded when None.
+
+    Returns:
+    --------
+    Dictionary mapping each SD pair to the list of its paths.
+
+    """
+
+    # Final demands.
+    demands = {}
+
+    # SD pairs still served, keyed on their number of paths and their position in D.
+    heap = []
+
+    for i, sd in enumerate(D):
+        demands[sd] = []
+        heap.append((0, i, sd))
+
+    heapq.heapify(heap)
+
+    while len(heap) > 0:
+
+        num_paths, i, sd_pair = heapq.heappop(heap)
+
+        if network.stats is not None:
+            network.stats.count("rounds")
 
         s = sd_pair[0]
         d = sd_pair[1]
 
-        paths = network.get_paths(s, d, graph)
+        # The lookahead depends on the links left, so it is rebuilt every round.
+        bounds = PathBounds(graph, d, max_hops, fidelities, min_fidelity)
 
-        if len(paths) > 0:
+        path = network.get_bounded_path(s, d, graph, bounds)
 
-            path = select_path(paths)
+        if len(path) > 0:
 
             graph = network.update_network(path, graph)
 
-            demands[sd_pair].append(list(path))
+            demands[sd_pair].append(path)
 
-            queue.append(sd_pair)
+            heapq.heappush(heap, (num_paths + 1, i, sd_pair))
 
-    k = 0
+    return demands
 
-    num_paths = []
+# Scheduling modes of run_sequential_multipath.
+SCHEDULERS = {
+    "smpsa": sequential_multipath_scheduling,
+    "max_flow": max_flow_multipath_scheduling,
+    "disjoint": disjoint_multipath_scheduling,
+    "concurrent": concurrent_multipath_scheduling
+}
 
-    for k, v in demands.items():
-        num_paths.append(len(v))
+# Columns of the results CSV.
+RESULT_COLUMNS = [
+    "num_nodes",
+    "num_sd_pairs",
+    "min_num_qubits_assigned",
+    "max_num_qubits_assigned",
+    "min_num_entangled_qubits",
+    "max_num_entangled_qubits",
+    "k"
+]
 
-    return min(num_paths)
+def run_trial(num_nodes, scheduler = "smpsa", rng = None, instrument = False, topology = None, network = None):
+    """
+    Builds a random network with num_nodes nodes, schedules a random SD pair
+    on it and returns the results row together with the network, its
+    entangled links and the scheduled demands.
 
-def run_sequential_multipath(save_figure = False):
+    With instrument, the row also holds the INSTRUMENTATION_COLUMNS. With a
+    topology from topologies.TOPOLOGIES, the network is generated by that
+    sparse generator instead of build_network. A given network is reset
+    and reused instead of allocating a new one, which overwrites the
+    objects returned for its previous trial.
+    """
 
-    results = {
-        "num_nodes": [],
-        "num_sd_pairs": [],
-        "min_num_qubits_assigned": [],
-        "max_num_qubits_assigned": [],
-        "min_num_entangled_qubits": [],
-        "max_num_entangled_qubits": [],
-        "k": []
-    }
+    # Initialize the network.
+    if network is None:
+        network = Network()
+    else:
+        network.reset()
 
-    x = 8
-    increment = 2
+    stats = Instrumentation() if instrument else None
 
-    while x < 33:
-    # for x in range(10, 20, 10):
+    network.stats = stats
 
-        exception = False
+    with stage_timer(stats, "build_network"):
+        if topology is None:
+            network.build_network(num_nodes, num_nodes, rng=rng)
+        else:
+            network.build_topology(topology, num_nodes, rng)
 
-        print('Num nodes:', x)
+    with stage_timer(stats, "assign_qubits"):
+        network.assign_qubits()
 
-        try:
-            # Initialize the network.
-            network = Network()
+    with stage_timer(stats, "entangle_qubits_in_network"):
+        network.entangle_qubits_in_network()
 
-            network.build_network(x, x)
-            network.assign_qubits()
-            network.entangle_qubits_in_network()
+    # Get nodes.
+    nodes = network.get_nodes()
 
-            # Get nodes.
-            nodes = network.get_nodes()
+    min_num_qubits_assigned = 10
+    max_num_qubits_assigned = -1
+    min_num_entangled_qubits = 10
+    max_num_entangled_qubits = -1
 
-            # Get number of nodes.
-            num_nodes = len(nodes)
+    for node in nodes:
 
-            min_num_qubits_assigned = 10
-            max_num_qubits_assigned = -1
-            min_num_entangled_qubits = 10
-            max_num_entangled_qubits = -1
+        num_qubits = node.get_num_qubits()
+        num_qubits_entangled = node.get_num_entangled_qubits()
 
-            for node in nodes:
+        if num_qubits > max_num_qubits_assigned:
+            max_num_qubits_assigned = num_qubits
 
-                num_qubits = node.get_num_qubits()
-                num_qubits_entangled = node.get_num_entangled_qubits()
+        if num_qubits < min_num_qubits_assigned:
+            min_num_qubits_assigned = num_qubits
 
-                if num_qubits > max_num_qubits_assigned:
-                    max_num_qubits_assigned = num_qubits
+        if num_qubits_entangled > max_num_entangled_qubits:
+            max_num_entangled_qubits = num_qubits_entangled
 
-                if num_qubits < min_num_qubits_assigned:
-                    min_num_qubits_assigned = num_qubits
+        if num_qubits_entangled < min_num_entangled_qubits:
+            min_num_entangled_qubits = num_qubits_entangled
 
-                if num_qubits_entangled > max_num_entangled_qubits:
-                    max_num_entangled_qubits = num_qubits_entangled
 
-                if num_qubits_entangled < min_num_entangled_qubits:
-                    min_num_entangled_qubits = num_qubits_entangled
+    with stage_timer(stats, "get_entangled_network"):
+        updated_network = network.get_entangled_network()
 
+    updated_network_copy = copy_graph(updated_network)
 
-            updated_network = network.get_entangled_network()
+    # Randomly generate the demands.
+    # D = network.generate_random_sd_pairs(random.randint(2, 4))
+    D = network.generate_random_sd_pairs(1)
 
-            updated_network_copy = copy_graph(updated_network)
+    with stage_timer(stats, "scheduling"):
+        demands = SCHEDULERS[scheduler](D, network, updated_network_copy)
 
-            # Randomly generate the demands.
-            # D = network.generate_random_sd_pairs(random.randint(2, 4))
-            D = network.generate_random_sd_pairs(1)
+    k = get_k(demands)
 
-            num_sd_pairs = len(D)
+    row = {
+        "num_nodes": len(nodes),
+        "num_sd_pairs": len(D),
+        "min_num_qubits_assigned": min_num_qubits_assigned,
+        "max_num_qubits_assigned": max_num_qubits_assigned,
+        "min_num_entangled_qubits": min_num_entangled_qubits,
+        "max_num_entangled_qubits": max_num_entangled_qubits,
+        "k": k
+    }
 
-            k = sequential_multipath_scheduling(D, network, updated_network_copy)
+    if stats is not None:
+        row.update(stats.as_row(len(D)))
 
-            if save_figure:
-                labels = get_labels(nodes)
+    return row, network, updated_network, demands
+
+def run_sequential_multipath(save_figure = False, scheduler = "smpsa", save_snapshots = False, resume = False, instrument = False):
+
+    if scheduler not in SCHEDULERS:
+        raise ValueError("Unknown scheduler %r, expected one of %s" % (scheduler, ", ".join(SCHEDULERS)))
+
+    # Every row is written as soon as its network size completes.
+    columns = RESULT_COLUMNS + INSTRUMENTATION_COLUMNS if instrument else RESULT_COLUMNS
+
+    results = ResultsWriter("results/sequential_multipath/test_1.csv", columns, resume)
+
+    renderer = None
 
-                G = nx.from_numpy_array(np.array(updated_network))
+    if save_figure:
+        # Rendering is only needed for the figures, so it is imported on demand.
+        from visualization import RenderPool
 
-                nx.draw(G, node_color='#f3f3f3ff', edgecolors='#3d85c6', font_size=12, labels=labels, edge_color='#cc0000', with_labels=True, style='--', node_size=2000)
+        renderer = RenderPool()
 
-                plt.savefig("visualization/sequential_multipath/%d.png" % (x, ))
-                # plt.show()
+    # One network is reused by every trial.
+    network = Network()
+
+    x = 8
+    increment = 2
+
+    # Skip the network sizes already in the results.
+    x += increment * results.num_rows
+
+    while x < 33:
+    # for x in range(10, 20, 10):
+
+        exception = False
+
+        print('Num nodes:', x)
+
+        try:
+            row, network, updated_network, demands = run_trial(x, scheduler, instrument=instrument, network=network)
+
+            if save_figure or save_snapshots:
+                snapshot = "results/sequential_multipath/snapshots/%d" % (x, )
+
+                save_snapshot(snapshot, network, updated_network, demands)
+
+            if save_figure:
+                renderer.submit(snapshot, "visualization/sequential_multipath/%d.png" % (x, ))
 
-            results["num_nodes"].append(num_nodes)
-            results["num_sd_pairs"].append(num_sd_pairs)
-            results["min_num_qubits_assigned"].append(min_num_qubits_assigned)
-            results["max_num_qubits_assigned"].append(max_num_qubits_assigned)
-            results["min_num_entangled_qubits"].append(min_num_entangled_qubits)
-            results["max_num_entangled_qubits"].append(max_num_entangled_qubits)
-            results["k"].append(k)
+            results.write(row)
 
         except:
             exception = True
@@ -146,6 +486,7 @@ def run_sequential_multipath(save_figure = False):
         if not exception:
             x += increment
 
-    df = pd.DataFrame(results)
-    df.to_csv("results/sequential_multipath/test_1.csv", index=False)
+    results.close()
 
+    if renderer is not None:
+        renderer.close()
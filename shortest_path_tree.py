@@ -0,0 +1,188 @@
+
+import heapq
+
+class ShortestPathTree:
+
+    def __init__(self, graph, dest, stats=None):
+        """
+        Hop distances of every node to a destination in a residual graph,
+        kept up to date as links get depleted.
+
+        Parameters:
+        -----------
+        graph : Graph
+            Residual entangled network. The tree keeps a reference to it, so
+            remove_links must be called whenever a link is removed from it.
+
+        dest : int
+            Destination node.
+
+        stats : Instrumentation
+            Counts the nodes expanded by the searches and the repairs, when
+            given.
+
+        Description:
+        --------------
+        dist : list
+            Hop distance of each node to the destination. Nodes that cannot
+            reach the destination are labeled with `unreachable`.
+
+            A node with distance h > 0 is supported by its neighbors with
+            distance h - 1. Removing a link only invalidates the nodes that
+            lose all of their supports, so the labels are repaired on that
+            region alone instead of searching the whole graph again.
+
+        """
+
+        self.graph = graph
+        self.dest = dest
+        self.stats = stats
+        self.unreachable = len(graph)
+        self.dist = [self.unreachable] * len(graph)
+
+        self.dist[dest] = 0
+
+        frontier = [dest]
+
+        expanded = 0
+
+        # Breadth-first search from the destination.
+        while len(frontier) > 0:
+
+            expanded += len(frontier)
+
+            next_frontier = []
+
+            for u in frontier:
+
+                for v in graph.neighbors(u):
+
+                    if self.dist[v] == self.unreachable:
+                        self.dist[v] = self.dist[u] + 1
+                        next_frontier.append(v)
+
+            frontier = next_frontier
+
+        if stats is not None:
+            stats.count("nodes_expanded", expanded)
+
+    def get_distance(self, node):
+        """
+        Returns the hop distance of the node to the destination.
+        """
+
+        return self.dist[node]
+
+    def get_path(self, source):
+        """
+        Returns the shortest path from the source to the destination, or an
+        empty list when the destination is unreachable.
+
+        Ties are broken towards the neighbor with the highest index at each
+        hop, like Network.get_shortest_path.
+        """
+
+        if self.dist[source] == self.unreachable:
+            return []
+
+        path = [source]
+        u = source
+
+        while u != self.dest:
+
+            u = max(v for v in self.graph.neighbors(u) if self.dist[v] == self.dist[u] - 1)
+
+            path.append(u)
+
+        return path
+
+    def _is_supported(self, node, affected):
+        """
+        Checks if the node has a neighbor one hop closer to the destination
+        that is not affected.
+        """
+
+        for v in self.graph.neighbors(node):
+
+            if self.dist[v] == self.dist[node] - 1 and v not in affected:
+                return True
+
+        return False
+
+    def remove_links(self, links):
+        """
+        Repairs the distances after the links were removed from the graph.
+
+        Parameters:
+        -----------
+        links : list
+            (u, v) tuples of the removed links.
+
+        """
+
+        affected = set()
+        stack = []
+
+        # The farther end of a removed tree link may have lost its support.
+        for u, v in links:
+
+            if self.dist[u] == self.dist[v] + 1:
+                stack.append(u)
+
+            elif self.dist[v] == self.dist[u] + 1:
+                stack.append(v)
+
+        # Collect the nodes whose every support is affected.
+        while len(stack) > 0:
+
+            u = stack.pop()
+
+            if u in affected or self.dist[u] == self.unreachable:
+                continue
+
+            if self._is_supported(u, affected):
+                continue
+
+            affected.add(u)
+
+            for v in self.graph.neighbors(u):
+
+                if self.dist[v] == self.dist[u] + 1:
+                    stack.append(v)
+
+        if self.stats is not None:
+            self.stats.count("nodes_expanded", len(affected))
+
+        if len(affected) == 0:
+            return
+
+        heap = []
+
+        # Seed the affected nodes from their unaffected neighbors.
+        for u in affected:
+
+            best = self.unreachable
+
+            for v in self.graph.neighbors(u):
+
+                if v not in affected and self.dist[v] + 1 < best:
+                    best = self.dist[v] + 1
+
+            self.dist[u] = best
+
+            if best < self.unreachable:
+                heapq.heappush(heap, (best, u))
+
+        # Propagate the new distances inside the affected region.
+        while len(heap) > 0:
+
+            dist_u, u = heapq.heappop(heap)
+
+            if dist_u != self.dist[u]:
+                continue
+
+            for v in self.graph.neighbors(u):
+
+                if v in affected and dist_u + 1 < self.dist[v]:
+                    self.dist[v] = dist_u + 1
+                    heapq.heappush(heap, (dist_u + 1, v))
@@ -0,0 +1,161 @@
+
+from network import Network
+from graph import Graph
+from node import Node
+import numpy as np
+import os
+
+# Arrays of a snapshot, each stored as <name>.npy in the snapshot directory.
+SNAPSHOT_ARRAYS = [
+    "network_indptr",
+    "network_indices",
+    "network_weights",
+    "num_qubits",
+    "peer_nodes",
+    "peer_qubits",
+    "entangled_indptr",
+    "entangled_indices",
+    "entangled_weights",
+    "demands",
+    "path_demands",
+    "path_indptr",
+    "path_nodes"
+]
+
+def save_snapshot(path, network, graph = None, demands = None):
+    """
+    Saves the network, its entangled links and the scheduled paths as a
+    directory of uncompressed .npy files that load_snapshot can memory-map.
+
+    Parameters:
+    -----------
+    path : string
+        Snapshot directory, created when missing.
+
+    network : Network
+        Network with its nodes assigned and entangled.
+
+    graph : Graph
+        Entangled links. Defaults to network.get_entangled_network().
+
+    demands : dict
+        SD pairs mapped to their paths, as returned by the schedulers.
+
+    Description:
+    --------------
+    The physical and the entangled links are stored in compressed sparse row
+    form (see Graph.to_csr). The qubits of all the nodes are concatenated in
+    node order into peer_nodes and peer_qubits. The SD pairs are stored as a
+    (num_demands, 2) array, and the nodes of path i, which serves
+    demands[path_demands[i]], are path_nodes[path_indptr[i]:path_indptr[i + 1]].
+
+    """
+
+    if graph is None:
+        graph = network.get_entangled_network()
+
+    if demands is None:
+        demands = {}
+
+    nodes = network.get_nodes()
+
+    arrays = {}
+
+    arrays["network_indptr"], arrays["network_indices"], arrays["network_weights"] = network.get_network().to_csr()
+    arrays["entangled_indptr"], arrays["entangled_indices"], arrays["entangled_weights"] = graph.to_csr()
+
+    arrays["num_qubits"] = np.array([node.get_num_qubits() for node in nodes], dtype=np.int64)
+    arrays["peer_nodes"] = np.concatenate([node.get_peer_nodes() for node in nodes] + [np.empty(0, dtype=np.int64)])
+    arrays["peer_qubits"] = np.concatenate([node.get_peer_qubits() for node in nodes] + [np.empty(0, dtype=np.int64)])
+
+    paths = [(i, path) for i, sd in enumerate(demands) for path in demands[sd]]
+
+    arrays["demands"] = np.array(list(demands), dtype=np.int64).reshape(-1, 2)
+    arrays["path_demands"] = np.array([i for i, _ in paths], dtype=np.int64)
+    arrays["path_indptr"] = np.concatenate([[0], np.cumsum([len(path) for _, path in paths], dtype=np.int64)]).astype(np.int64)
+    arrays["path_nodes"] = np.array([node for _, path in paths for node in path], dtype=np.int64)
+
+    os.makedirs(path, exist_ok=True)
+
+    for name in SNAPSHOT_ARRAYS:
+        np.save(os.path.join(path, name + ".npy"), arrays[name])
+
+def load_snapshot(path, mmap = True):
+    """
+    Returns the arrays of a snapshot as a dictionary. With mmap the arrays
+    are read-only memory maps of the files, so nothing is copied until the
+    data is accessed.
+    """
+
+    mmap_mode = "r" if mmap else None
+
+    return {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode) for name in SNAPSHOT_ARRAYS}
+
+def get_num_entangled_qubits(snapshot):
+    """
+    Returns the number of entangled qubits of each node in the snapshot.
+    """
+
+    num_qubits = snapshot["num_qubits"]
+
+    owners = np.repeat(np.arange(len(num_qubits)), num_qubits)
+
+    return np.bincount(owners[snapshot["peer_nodes"] != -1], minlength=len(num_qubits))
+
+def get_demands(snapshot):
+    """
+    Returns the SD pairs of the snapshot mapped to their paths.
+    """
+
+    demands = {}
+
+    for s, d in snapshot["demands"].tolist():
+        demands[(s, d)] = []
+
+    sd_pairs = list(demands)
+
+    path_indptr = snapshot["path_indptr"].tolist()
+    path_nodes = snapshot["path_nodes"].tolist()
+
+    for i, demand in enumerate(snapshot["path_demands"].tolist()):
+        demands[sd_pairs[demand]].append(path_nodes[path_indptr[i]:path_indptr[i + 1]])
+
+    return demands
+
+def restore_snapshot(snapshot):
+    """
+    Rebuilds the network and its entangled links from a snapshot.
+
+    Returns:
+    --------
+    The Network, the entangled Graph and the list of SD pairs, ready to be
+    scheduled again, e.g. SCHEDULERS[name](D, network, graph).
+
+    """
+
+    network = Network()
+
+    network.network = Graph.from_csr(snapshot["network_indptr"], snapshot["network_indices"], snapshot["network_weights"])
+
+    num_qubits = snapshot["num_qubits"].tolist()
+
+    # The nodes get their own writable copy of the qubit arrays.
+    peer_nodes = np.array(snapshot["peer_nodes"])
+    peer_qubits = np.array(snapshot["peer_qubits"])
+
+    offset = 0
+
+    for i, q in enumerate(num_qubits):
+
+        node = Node(str(i), q, i)
+        node.set_entanglements(peer_nodes[offset:offset + q], peer_qubits[offset:offset + q])
+
+        network.nodes.append(node)
+
+        offset += q
+
+    graph = Graph.from_csr(snapshot["entangled_indptr"], snapshot["entangled_indices"], snapshot["entangled_weights"])
+
+    D = [tuple(sd) for sd in snapshot["demands"].tolist()]
+
+    return network, graph, D
@@ -0,0 +1,157 @@
+
+from sequential_multipath import run_trial, RESULT_COLUMNS, SCHEDULERS
+from results_writer import ResultsWriter
+from instrumentation import INSTRUMENTATION_COLUMNS
+from topologies import TOPOLOGIES
+from network import Network
+import numpy as np
+import pandas as pd
+import multiprocessing
+import argparse
+import random
+import traceback
+import math
+
+# Number of times a cell is retried with fresh randomness before giving up.
+MAX_ATTEMPTS = 10
+
+# Network reused by every cell run in this process.
+_network = Network()
+
+def _cell_seed(seed, num_nodes, trial, attempt):
+    """
+    Returns the seed of a sweep cell, independent of the process running it.
+    """
+
+    return int(np.random.SeedSequence([seed, num_nodes, trial, attempt]).generate_state(1)[0])
+
+def run_cell(cell):
+    """
+    Runs one (num_nodes, seed, trial, scheduler, instrument, topology) cell of
+    the sweep and returns its results row.
+    """
+
+    num_nodes, seed, trial, scheduler, instrument, topology = cell
+
+    for attempt in range(MAX_ATTEMPTS):
+
+        cell_seed = _cell_seed(seed, num_nodes, trial, attempt)
+
+        # Qubit assignment and SD pairs still draw from the random module.
+        random.seed(cell_seed)
+
+        try:
+            row, _, _, _ = run_trial(num_nodes, scheduler, np.random.default_rng(cell_seed), instrument, topology, _network)
+
+            return row
+
+        except Exception:
+            print(traceback.format_exc())
+
+    raise RuntimeError("Cell %r failed %d times" % (cell, MAX_ATTEMPTS))
+
+def summarize(df):
+    """
+    Returns the mean k per network size with its 95% confidence interval.
+    """
+
+    summary = df.groupby("num_nodes")["k"].agg(["count", "mean", "std"]).reset_index()
+
+    summary["std"] = summary["std"].fillna(0)
+    summary["ci95"] = 1.96 * summary["std"] / summary["count"].map(math.sqrt)
+
+    return summary
+
+def run_sweep(sizes = range(8, 33, 2), trials = 1, seed = 0, scheduler = "smpsa", processes = None, output = "results/sequential_multipath/sweep.csv", resume = False, instrument = False, topology = None):
+    """
+    Runs every (size, trial) cell of the sweep on a process pool and appends
+    the rows to output, in the CSV schema of run_sequential_multipath, as
+    they complete.
+
+    Parameters:
+    -----------
+    sizes : iterable
+        Number of nodes of the networks.
+
+    trials : int
+        Number of random networks per size.
+
+    seed : int
+        Base seed, every cell derives its own seed from it.
+
+    scheduler : string
+        Scheduling mode, one of SCHEDULERS.
+
+    processes : int
+        Number of worker processes. Uses all the cores when None.
+
+    output : string
+        Path of the results CSV.
+
+    resume : bool
+        Keeps the rows already in output and only runs the cells after them.
+        The sweep parameters must be the same as in the interrupted run.
+
+    instrument : bool
+        Adds the INSTRUMENTATION_COLUMNS counters and timers to every row.
+
+    topology : string
+        Sparse topology generator of the networks, one of
+        topologies.TOPOLOGIES. Uses Network.build_network when None.
+
+    Returns:
+    --------
+    The per-size summary of k returned by summarize.
+
+    """
+
+    if scheduler not in SCHEDULERS:
+        raise ValueError("Unknown scheduler %r, expected one of %s" % (scheduler, ", ".join(SCHEDULERS)))
+
+    if topology is not None and topology not in TOPOLOGIES:
+        raise ValueError("Unknown topology %r, expected one of %s" % (topology, ", ".join(TOPOLOGIES)))
+
+    cells = [(num_nodes, seed, trial, scheduler, instrument, topology) for num_nodes in sizes for trial in range(trials)]
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    # Hand out the cells in batches to amortize the inter-process overhead.
+    chunksize = max(1, len(cells) // (4 * processes))
+
+    columns = RESULT_COLUMNS + INSTRUMENTATION_COLUMNS if instrument else RESULT_COLUMNS
+
+    with ResultsWriter(output, columns, resume) as writer:
+
+        # The rows come back in cell order, so the completed cells are the first ones.
+        remaining = cells[writer.num_rows:]
+
+        if len(remaining) > 0:
+
+            with multiprocessing.Pool(processes) as pool:
+
+                for row in pool.imap(run_cell, remaining, chunksize):
+                    writer.write(row)
+
+    return summarize(pd.read_csv(output, usecols=["num_nodes", "k"]))
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Parallel sweep of the sequential multipath scheduling.")
+    parser.add_argument("--min-nodes", type=int, default=8)
+    parser.add_argument("--max-nodes", type=int, default=32)
+    parser.add_argument("--step", type=int, default=2)
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scheduler", choices=list(SCHEDULERS), default="smpsa")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--output", default="results/sequential_multipath/sweep.csv")
+    parser.add_argument("--instrument", action="store_true", help="Add the counters and stage timers to the rows.")
+    parser.add_argument("--topology", choices=list(TOPOLOGIES), default=None, help="Generate sparse networks of this topology instead of the dense random ones.")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted sweep from its last completed cell.")
+
+    args = parser.parse_args()
+
+    summary = run_sweep(range(args.min_nodes, args.max_nodes + 1, args.step), args.trials, args.seed, args.scheduler, args.processes, args.output, args.resume, args.instrument, args.topology)
+
+    print(summary.to_string(index=False))
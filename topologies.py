@@ -0,0 +1,289 @@
+
+from graph import Graph
+import numpy as np
+import math
+
+def _unique_links(num_nodes, us, vs):
+    """
+    Returns the links with u < v, without self loops or duplicates.
+    """
+
+    us, vs = np.minimum(us, vs), np.maximum(us, vs)
+
+    keys = np.unique((us * num_nodes + vs)[us != vs])
+
+    return keys // num_nodes, keys % num_nodes
+
+def grid_graph(num_nodes, cols=None, periodic=False, rng=None):
+    """
+    Generates a square lattice.
+
+    Parameters:
+    -----------
+    num_nodes : int
+        Number of nodes, filled in row-major order. The last row is partial
+        when num_nodes is not a multiple of cols.
+
+    cols : int
+        Number of nodes per row. Defaults to ceil(sqrt(num_nodes)).
+
+    periodic : bool
+        Wraps the rows and columns around into a torus.
+
+    rng : numpy.random.Generator
+        Unused, the lattice is deterministic.
+
+    """
+
+    if cols is None:
+        cols = max(1, math.ceil(math.sqrt(num_nodes)))
+
+    nodes = np.arange(num_nodes)
+    row, col = nodes // cols, nodes % cols
+    num_rows = math.ceil(num_nodes / cols)
+
+    # Link every node to its right and lower neighbors.
+    if periodic:
+        right = row * cols + (col + 1) % cols
+        down = ((row + 1) % num_rows) * cols + col
+    else:
+        right = np.where(col + 1 < cols, nodes + 1, -1)
+        down = nodes + cols
+
+    us = np.concatenate([nodes, nodes])
+    vs = np.concatenate([right, down])
+
+    valid = (vs >= 0) & (vs < num_nodes)
+
+    us, vs = _unique_links(num_nodes, us[valid], vs[valid])
+
+    return Graph.from_edges(num_nodes, us, vs)
+
+def waxman_graph(num_nodes, alpha=None, beta=0.4, mean_degree=4, cutoff=1e-3, rng=None):
+    """
+    Generates a Waxman random geometric graph on the unit square.
+
+    Nodes u and v at distance d are linked with probability
+    beta * exp(-d / (alpha * L)), where L = sqrt(2) is the largest distance.
+
+    Parameters:
+    -----------
+    num_nodes : int
+        Number of nodes, placed uniformly at random.
+
+    alpha : float
+        Link length scale, relative to L. Defaults to the scale giving about
+        mean_degree links per node away from the borders, which keeps the
+        graph sparse as num_nodes grows.
+
+    beta : float
+        Link probability of two nodes at the same place.
+
+    mean_degree : float
+        Expected number of links per node when alpha is None.
+
+    cutoff : float
+        Links less likely than cutoff are never drawn. Only the nodes within
+        the resulting radius are compared, through a grid of cells, so the
+        generator runs in O(num_nodes + number of candidate pairs).
+
+    rng : numpy.random.Generator
+        Source of randomness. A fresh unseeded generator when None.
+
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    length = math.sqrt(2)
+
+    if alpha is None:
+        # A node has about num_nodes * beta * 2 * pi * (alpha * L) ** 2 links.
+        alpha = math.sqrt(mean_degree / (2 * math.pi * beta * max(num_nodes, 1))) / length
+
+    radius = min(length, alpha * length * math.log(beta / cutoff)) if beta > cutoff else 0.0
+
+    points = rng.random((num_nodes, 2))
+
+    if radius == 0.0 or num_nodes < 2:
+        return Graph.from_edges(num_nodes, [], [])
+
+    # Bucket the nodes into square cells of side radius.
+    num_cells = max(1, int(1 / radius))
+    cells = np.minimum((points * num_cells).astype(np.int64), num_cells - 1)
+    cell_ids = cells[:, 0] * num_cells + cells[:, 1]
+
+    order = np.argsort(cell_ids, kind='stable')
+    bounds = np.searchsorted(cell_ids[order], np.arange(num_cells * num_cells + 1))
+
+    us, vs = [], []
+
+    # Compare each cell with itself and half of its neighbors, so each pair is seen once.
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+
+        x, y = cells[:, 0] + dx, cells[:, 1] + dy
+
+        inside = (x >= 0) & (x < num_cells) & (y >= 0) & (y < num_cells)
+
+        u = np.flatnonzero(inside)
+        other = x[u] * num_cells + y[u]
+
+        start, end = bounds[other], bounds[other + 1]
+        counts = end - start
+
+        # One candidate pair per node of the other cell.
+        u = np.repeat(u, counts)
+        v = order[np.repeat(start, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+
+        if dx == 0 and dy == 0:
+            keep = u < v
+            u, v = u[keep], v[keep]
+
+        distance = np.hypot(*(points[u] - points[v]).T)
+
+        links = (distance <= radius) & (rng.random(len(u)) < beta * np.exp(-distance / (alpha * length)))
+
+        us.append(u[links])
+        vs.append(v[links])
+
+    us, vs = _unique_links(num_nodes, np.concatenate(us), np.concatenate(vs))
+
+    return Graph.from_edges(num_nodes, us, vs)
+
+def barabasi_albert_graph(num_nodes, m=2, rng=None):
+    """
+    Generates a Barabási–Albert preferential attachment graph.
+
+    Node m is linked to the first m nodes, then every new node is linked to
+    m distinct earlier nodes chosen with probability proportional to their
+    degree.
+
+    Parameters:
+    -----------
+    num_nodes : int
+        Number of nodes, at least m + 1.
+
+    m : int
+        Number of links of every new node.
+
+    rng : numpy.random.Generator
+        Source of randomness. A fresh unseeded generator when None.
+
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if m < 1 or num_nodes <= m:
+        raise ValueError("Barabási–Albert graphs need 1 <= m < num_nodes, got m=%d, num_nodes=%d" % (m, num_nodes))
+
+    num_links = m * (num_nodes - m)
+
+    us = np.empty(num_links, dtype=np.int64)
+    vs = np.empty(num_links, dtype=np.int64)
+
+    # Every link end point once, so uniform draws pick nodes in proportion to degree.
+    ends = np.empty(2 * num_links, dtype=np.int64)
+
+    us[:m] = m
+    vs[:m] = np.arange(m)
+    ends[:m] = np.arange(m)
+    ends[m:2 * m] = m
+
+    # Uniform draws, refilled when used up.
+    draws = rng.random(2 * num_links).tolist()
+    drawn = 0
+
+    num_ends = 2 * m
+    num_links = m
+
+    for node in range(m + 1, num_nodes):
+
+        targets = set()
+
+        while len(targets) < m:
+
+            if drawn == len(draws):
+                draws = rng.random(len(draws)).tolist()
+                drawn = 0
+
+            targets.add(int(ends[int(draws[drawn] * num_ends)]))
+            drawn += 1
+
+        targets = list(targets)
+
+        us[num_links:num_links + m] = node
+        vs[num_links:num_links + m] = targets
+
+        ends[num_ends:num_ends + m] = targets
+        ends[num_ends + m:num_ends + 2 * m] = node
+
+        num_links += m
+        num_ends += 2 * m
+
+    return Graph.from_edges(num_nodes, vs, us)
+
+def ring_with_chords_graph(num_nodes, num_chords=None, rng=None):
+    """
+    Generates a ring with random chords.
+
+    Parameters:
+    -----------
+    num_nodes : int
+        Number of nodes, linked in a ring in index order.
+
+    num_chords : int
+        Number of distinct random links added between nodes that are not
+        neighbors on the ring. Defaults to num_nodes // 2.
+
+    rng : numpy.random.Generator
+        Source of randomness. A fresh unseeded generator when None.
+
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if num_chords is None:
+        num_chords = num_nodes // 2
+
+    nodes = np.arange(num_nodes)
+
+    ring_us, ring_vs = _unique_links(num_nodes, nodes, (nodes + 1) % num_nodes)
+
+    max_chords = num_nodes * (num_nodes - 1) // 2 - len(ring_us)
+
+    if num_chords > max_chords:
+        raise ValueError("A ring of %d nodes has room for %d chords, got %d" % (num_nodes, max_chords, num_chords))
+
+    ring = set((ring_us * num_nodes + ring_vs).tolist())
+    chords = set()
+
+    # Draw in batches until enough distinct chords are found.
+    while len(chords) < num_chords:
+
+        us = rng.integers(0, num_nodes, 2 * num_chords)
+        vs = rng.integers(0, num_nodes, 2 * num_chords)
+
+        for key in (np.minimum(us, vs) * num_nodes + np.maximum(us, vs))[us != vs].tolist():
+
+            if len(chords) == num_chords:
+                break
+
+            if key not in ring:
+                chords.add(key)
+
+    chords = np.array(sorted(chords), dtype=np.int64)
+
+    us = np.concatenate([ring_us, chords // num_nodes])
+    vs = np.concatenate([ring_vs, chords % num_nodes])
+
+    return Graph.from_edges(num_nodes, us, vs)
+
+# Sparse topology generators by name, for Network.build_topology.
+TOPOLOGIES = {
+    "grid": grid_graph,
+    "waxman": waxman_graph,
+    "barabasi_albert": barabasi_albert_graph,
+    "ring_with_chords": ring_with_chords_graph
+}
@@ -1,3 +1,4 @@
+from residual_graph import ResidualGraph
 
 def select_path(paths):
 
@@ -13,24 +14,19 @@ def select_path(paths):
 
     return path
 
-def copy_graph(matrix):
+def get_k(demands):
 
-    graph = []
+    return min(len(paths) for paths in demands.values())
 
-    v = len(matrix)
+def copy_graph(graph):
 
-    for i in range(v):
+    # A copy-on-write view, so the copy costs O(1) and stores only the consumed links.
+    if isinstance(graph, ResidualGraph):
+        return graph.fork()
 
-        row = []
+    return ResidualGraph(graph)
 
-        for j in range(v):
-            row.append(matrix[i][j])
-
-        graph.append(row)
-
-    return graph
-
-def get_labels(nodes):
+def get_labels(num_qubits, num_entangled_qubits):
 
     labels = {}
 
@@ -47,7 +43,10 @@ def get_labels(nodes):
         '9': '₉'
     }
 
-    for i, node in enumerate(nodes):
-        labels[i] = str(i) + ' ' + nums[str(node.get_num_qubits())] + ',' + nums[str(node.get_num_entangled_qubits())]
+    for i in range(len(num_qubits)):
+        qubits = ''.join(nums[c] for c in str(num_qubits[i]))
+        entangled = ''.join(nums[c] for c in str(num_entangled_qubits[i]))
+
+        labels[i] = str(i) + ' ' + qubits + ',' + entangled
 
     return labels
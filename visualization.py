@@ -0,0 +1,115 @@
+
+from snapshot import load_snapshot, get_num_entangled_qubits
+from utils import get_labels
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import argparse
+import os
+
+def render_networkx(snapshot, output):
+    """
+    Draws the entangled links of a snapshot with networkx and saves the
+    figure to output.
+    """
+
+    # Imported here so that only the rendering workers pay for it.
+    import matplotlib
+    matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    labels = get_labels(snapshot["num_qubits"].tolist(), get_num_entangled_qubits(snapshot).tolist())
+
+    indptr = snapshot["entangled_indptr"]
+
+    us = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    vs = snapshot["entangled_indices"]
+
+    G = nx.Graph()
+    G.add_nodes_from(range(len(indptr) - 1))
+    G.add_weighted_edges_from(zip(us.tolist(), vs.tolist(), snapshot["entangled_weights"].tolist()))
+
+    # Draw every topology on its own figure.
+    fig = plt.figure()
+
+    nx.draw(G, ax=fig.gca(), node_color='#f3f3f3ff', edgecolors='#3d85c6', font_size=12, labels=labels, edge_color='#cc0000', with_labels=True, style='--', node_size=2000)
+
+    fig.savefig(output)
+
+    plt.close(fig)
+
+# Available renderers, each called with the loaded snapshot and the output path.
+RENDERERS = {
+    "networkx": render_networkx
+}
+
+def render_snapshot(path, output, renderer = "networkx"):
+    """
+    Renders the snapshot saved by snapshot.save_snapshot at path.
+    """
+
+    RENDERERS[renderer](load_snapshot(path), output)
+
+class RenderPool:
+
+    def __init__(self, processes=None, renderer="networkx"):
+        """
+        Renders saved snapshots in background worker processes while the
+        simulation keeps running.
+
+        Parameters:
+        -----------
+        processes : int
+            Number of worker processes. Uses all the cores when None.
+
+        renderer : string
+            Name of the renderer in RENDERERS.
+
+        """
+
+        if renderer not in RENDERERS:
+            raise ValueError("Unknown renderer %r, expected one of %s" % (renderer, ", ".join(RENDERERS)))
+
+        self.renderer = renderer
+        self.executor = ProcessPoolExecutor(processes)
+        self.futures = []
+
+    def submit(self, path, output):
+        """
+        Queues the rendering of the snapshot at path to output.
+        """
+
+        self.futures.append(self.executor.submit(render_snapshot, path, output, self.renderer))
+
+    def close(self):
+        """
+        Waits for the queued renderings and stops the workers. Raises the
+        first rendering error, if any.
+        """
+
+        try:
+            for future in self.futures:
+                future.result()
+
+        finally:
+            self.executor.shutdown()
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Render snapshots saved by snapshot.save_snapshot.")
+    parser.add_argument("snapshots", nargs="+")
+    parser.add_argument("--output-dir", default="visualization/sequential_multipath")
+    parser.add_argument("--renderer", choices=list(RENDERERS), default="networkx")
+    parser.add_argument("--processes", type=int, default=None)
+
+    args = parser.parse_args()
+
+    pool = RenderPool(args.processes, args.renderer)
+
+    for path in args.snapshots:
+        name = os.path.basename(os.path.normpath(path))
+
+        pool.submit(path, os.path.join(args.output_dir, name + ".png"))
+
+    pool.close()